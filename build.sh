@@ -10,16 +10,27 @@ else
     exit 1
 fi
 
+# ./build.sh           one file, dist/LinuxDesktopApp; it unpacks itself to a
+#                      fresh temp directory on every start
+# ./build.sh --onedir  a folder, dist/LinuxDesktopApp/LinuxDesktopApp; unpacked
+#                      once here, so repeat launches skip the extraction
+MODE="--onefile"
+OUT="dist/LinuxDesktopApp"
+if [ "$1" = "--onedir" ]; then
+    MODE="--onedir"
+    OUT="dist/LinuxDesktopApp/LinuxDesktopApp"
+fi
+
 echo "Cleaning previous builds..."
 rm -rf build/ dist/
 
 echo "Building application with PyInstaller..."
 pyinstaller --name "LinuxDesktopApp" \
-            --onefile \
+            $MODE \
             --windowed \
             --clean \
             --paths src \
             --add-data "src/assets:assets" \
             src/main.py
 
-echo "Build complete! Executable is located at dist/LinuxDesktopApp"
+echo "Build complete! Executable is located at $OUT"
@@ -0,0 +1,557 @@
+"""
+Road Rash benchmarks — reproducible, headless timings for CI.
+
+  python src/bench.py sim     [--races N] [--ticks N] [--seed S]
+  python src/bench.py proj    [--frames N]
+  python src/bench.py lanes   [--queries N] [--counts 30,300,...]
+  python src/bench.py riders  [--ticks N] [--counts 30,300,...]
+  python src/bench.py track   [--segments N] [--seed S]
+  python src/bench.py load    [--segments N] [--seed S]
+  python src/bench.py pipe    [--scenario NAME] [--frames N]
+  python src/bench.py fill    [--scenario NAME] [--frames N] [--endless SEED]
+  python src/bench.py launch  [--reps N]
+  python src/bench.py startup [--reps N] [--exe PATH] [--imports N]
+  python src/bench.py frame   [--scenario NAME] [--stages] [--count] [--scale K]
+                              [--lod-bias F] [--assets] [--road-fill poly|scan]
+                              [--save JSON] [--baseline JSON] [--tolerance F]
+"""
+import sys, os, math, time, json, argparse, tempfile, signal, subprocess
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import roadrash as rr
+
+
+def weave(sim):
+    """Deterministic test rider: full throttle, slow sinusoidal weave."""
+    return (True, False, int(round(math.sin(sim.ticks * 0.05))))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SIMULATION THROUGHPUT
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_sim(a):
+    road = rr.Road(rr.random.Random(a.seed))
+    ticks = crashes = fx_peak = 0
+    digest = 0.0
+    t0 = time.perf_counter()
+    for n in range(a.races):
+        sim = rr.simulate(weave, a.ticks, seed=a.seed + n, road=road)
+        ticks += sim.ticks
+        crashes += sim.dead
+        fx_peak = max(fx_peak, sim.fx.peak)
+        digest += sim.pos + sim.px + sim.score
+    el = time.perf_counter() - t0
+    print(f"sim: {a.races} races, {ticks} ticks in {el:.3f}s")
+    print(f"  {ticks / el:,.0f} ticks/s   {a.races / el:,.1f} races/s")
+    print(f"  crashes={crashes}  particle peak={fx_peak}/{rr.PARTICLE_CAP}  digest={digest:.6f}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ROAD PROJECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_proj(a):
+    road = rr.Road(rr.random.Random(1))
+    cams = [((n * 37) % rr.N_SEG, ((n % 41) / 20.0 - 1.0) * rr.ROAD_W) for n in range(a.frames)]
+    paths = [("python", road._project_py)]
+    if rr.np is not None:
+        paths.append(("numpy", road._project_np))
+        for si0, cx in cams[:50]:
+            assert road._project_py(si0, cx) == road._project_np(si0, cx), (si0, cx)
+    else:
+        print("proj: numpy not installed, python path only")
+    for name, fn in paths:
+        t0 = time.perf_counter()
+        for si0, cx in cams:
+            fn(si0, cx)
+        el = time.perf_counter() - t0
+        print(f"proj[{name:6}]: {el / a.frames * 1e6:8.1f} us/frame  ({a.frames} frames)")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COLLISION BROAD-PHASE
+# ═══════════════════════════════════════════════════════════════════════════════
+def scan(rs, si, x, r, span=1):
+    """Per-segment linear scan, the reference the bisecting lane index is timed against."""
+    out = []
+    for d in range(-span, span + 1):
+        s = (si + d) % rr.N_SEG
+        out += [rs.order[k] for k in range(rs.start[s], rs.start[s + 1])
+                if abs(rs.slane[k] - x) < r]
+    return out
+
+
+def bench_lanes(a):
+    qrng = rr.random.Random(2)
+    qs = [(qrng.randrange(rr.N_SEG), qrng.uniform(-0.95, 0.95)) for _ in range(a.queries)]
+    for n in map(int, a.counts.split(",")):
+        rs = rr.Riders()
+        rs.spawn(rr.random.Random(1), n, 30.0)
+        for si, x in qs[:200]:
+            assert sorted(scan(rs, si, x, 0.2)) == sorted(rs.near(si, x, 0.2)), (n, si, x)
+        row = []
+        for fn in (scan, rr.Riders.near):
+            t0 = time.perf_counter()
+            for si, x in qs:
+                fn(rs, si, x, 0.2)
+            row.append((time.perf_counter() - t0) / a.queries * 1e6)
+        print(f"lanes: {n:>8} riders   scan {row[0]:9.2f} us/query   index {row[1]:7.2f} us/query")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RIDER MOVEMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_riders(a):
+    backends = [("array", False)] + ([("numpy", True)] if rr.np is not None else [])
+    for n in map(int, a.counts.split(",")):
+        row = []
+        for name, vec in backends:
+            rs = rr.Riders(vec)
+            rng = rr.random.Random(1)
+            rs.spawn(rng, n, 30.0)
+            t0 = time.perf_counter()
+            for _ in range(a.ticks):
+                rs.step(1.0 / rr.FPS, rng)
+            el = (time.perf_counter() - t0) / a.ticks
+            row.append(f"{name} {el * 1e3:8.3f} ms/tick ({min(99999, 1 / el):7,.0f} Hz)")
+        print(f"riders: {n:>7}   " + "   ".join(row))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STREAMED TRACK
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_track(a):
+    for name, mk in (("ring", lambda: rr.Road(rr.random.Random(a.seed))),
+                     ("stream", lambda: rr.Track(a.seed))):
+        t0 = time.perf_counter()
+        road = mk()
+        road.project(0, 0.0)
+        print(f"track[{name:6}]: first frame ready in {(time.perf_counter() - t0) * 1e3:7.2f} ms")
+    road = rr.Track(a.seed)
+    ref = [(road.get(i).c, road.get(i).h) for i in range(0, 4096, 13)]
+    peak = 0
+    t0 = time.perf_counter()
+    for si0 in range(0, a.segments, 4):         # one projection per 4 segments driven
+        road.project(si0, 0.0)
+        peak = max(peak, len(road.chunks))
+    el = time.perf_counter() - t0
+    st = road.stats()
+    assert ref == [(road.get(i).c, road.get(i).h) for i in range(0, 4096, 13)]
+    print(f"track[stream]: drove {a.segments:,} segments, {el / (a.segments / 4) * 1e6:.1f} us/projection")
+    print(f"  chunks built {st['made']}  evicted {st['evicted']}  peak in memory {peak}"
+          f" ({peak * rr.CHUNK} segments)  regenerated chunks identical")
+
+
+def bench_load(a):
+    src = rr.Track(a.seed)
+    with tempfile.TemporaryDirectory() as d:
+        path, jpath = os.path.join(d, "course.rrt"), os.path.join(d, "course.json")
+        t0 = time.perf_counter()
+        rr.save_track(src, path, a.segments)
+        el = time.perf_counter() - t0
+        size = os.path.getsize(path)
+        print(f"load: exported {a.segments:,} segments in {el:.2f}s -> {size / 1e6:.1f} MB"
+              f" ({size / a.segments:.1f} B/segment)")
+        m = rr.MappedRoad(path)
+        with open(jpath, 'w') as f:           # the parse-everything alternative
+            json.dump({'c': list(m.c), 'h': list(m.h), 'win': list(m.win),
+                       'obj': [m.get(i).obj for i in range(a.segments)]}, f)
+        m.close()
+
+        def mapped():
+            r = rr.MappedRoad(path)
+            r.project(a.segments // 2, 0.0)
+            r.close()
+
+        def parsed():
+            with open(jpath) as f:
+                js = json.load(f)
+            segs = [rr.Seg(i, c, h) for i, (c, h) in enumerate(zip(js['c'], js['h']))]
+            for seg, w, o in zip(segs, js['win'], js['obj']):
+                seg.win, seg.obj = w, [tuple(x) for x in o]
+        for name, fn, reps in (("mmap", mapped, 20), ("json", parsed, 2)):
+            ts = []
+            for _ in range(reps):
+                t0 = time.perf_counter()
+                fn()
+                ts.append((time.perf_counter() - t0) * 1e3)
+            print(f"load[{name}]: {rr.pct(ts, 50):9.2f} ms to first frame (median of {reps})")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RENDER SUITE — offscreen Game._drw on seeded scenarios
+# ═══════════════════════════════════════════════════════════════════════════════
+#  name:       (racing, riders, every-nth-segment building)
+SCENARIOS = {
+    'title':     (False, rr.RIDERS, 0),
+    'race':      (True, rr.RIDERS, 0),
+    'traffic':   (True, 600, 0),
+    'buildings': (True, rr.RIDERS, 2),
+}
+
+
+def setup(g, name, seed):
+    """Reset Game g into scenario `name`: fixed road, riders and RNG state."""
+    racing, riders, bldg = SCENARIOS[name]
+    rr.random.seed(seed)
+    g.road = rr.Road(rr.random.Random(seed))
+    if bldg:
+        for i in range(0, rr.N_SEG, bldg):
+            seg = g.road.s[i]
+            if not any(ot == 'B' for _, ot in seg.obj):
+                seg.obj.append((1 if i % 4 else -1, 'B'))
+                seg.win = rr.window_mask(g.road.seed * rr.N_SEG + i)
+    g.n_riders = riders
+    g.collide = False           # a crash would drop the race back to the title screen
+    g.reset(seed=seed)
+    g.go = racing
+    if racing:
+        g.spd = g.mspd
+    if g.spr is not None:       # a RenderWorker's caches warm up in the warmup frames
+        g.spr.clear()
+
+
+def advance(g):
+    """One tick along the fixed camera path (riders are ridden through)."""
+    dt = 1.0 / rr.FPS
+    if g.go:
+        g.step(dt, weave(g))
+    else:
+        g.pos = (g.pos + g.mspd * 0.35 * dt) % g.road.length
+        g.wheel_angle += 3.0 * dt
+
+
+def bench_frame(a):
+    import warnings
+    warnings.simplefilter("ignore")         # SysFont complains without fc-list
+    g = rr.Game(scale=a.scale, lod_bias=a.lod_bias, assets=a.assets, road_fill=a.road_fill)
+    if a.count:
+        g.prof.hook()
+    pf = g.prof
+    names = a.scenario or list(SCENARIOS)
+    res = {}
+    for name in names:
+        setup(g, name, a.seed)
+        for _ in range(a.warmup):
+            advance(g)
+            g._drw()
+            g._compose()
+        pf.reset()
+        for _ in range(a.frames):
+            pf.frame()
+            advance(g)
+            pf.lap('upd')
+            g._drw()
+            g._compose()
+        pf.frame()
+        ts = [r['frame'] - r['upd'] for r in pf.rows]
+        mean = sum(ts) / len(ts)
+        res[name] = {'fps': 1e3 / mean, 'mean': mean, 'p50': rr.pct(ts, 50),
+                     'p95': rr.pct(ts, 95), 'p99': rr.pct(ts, 99)}
+        r = res[name]
+        print(f"frame[{name:9}] {r['fps']:7.1f} fps   mean {mean:6.2f}  p50 {r['p50']:6.2f}  "
+              f"p95 {r['p95']:6.2f}  p99 {r['p99']:6.2f} ms")
+        if a.stages:
+            for k, v in pf.summary(pf.rows).items():
+                print(f"    {k:8} p50 {v['p50']:6.2f}   p95 {v['p95']:6.2f}   p99 {v['p99']:6.2f}")
+        if a.count:
+            n = len(pf.rows)
+            r['calls'] = sum(x['calls'] for x in pf.rows) / n
+            r['surfs'] = sum(x['surfs'] for x in pf.rows) / n
+            print(f"    draw calls/frame {r['calls']:.1f}   surfaces/frame {r['surfs']:.1f}")
+            r['lod'] = g.spr.stats()['lod_per_frame']
+            print("    sprites/frame by lod (.., culled): " +
+                  "   ".join(f"{k} {'/'.join(f'{v:g}' for v in n)}" for k, n in r['lod'].items()))
+    if a.save:
+        with open(a.save, 'w') as f:
+            json.dump(res, f, indent=2)
+        print(f"saved baseline -> {a.save}")
+    if a.baseline:
+        with open(a.baseline) as f:
+            base = json.load(f)
+        bad = []
+        for name, r in res.items():
+            b = base.get(name)
+            if b is None:
+                continue
+            # p50 gates; the tail is too noisy on shared CI boxes, so it only reports
+            for k in ('p50', 'p95'):
+                d = (r[k] / b[k] - 1) * 100
+                print(f"  {name}.{k}: {r[k]:6.2f} ms vs {b[k]:6.2f} ms ({d:+.0f}%)")
+                if k == 'p50' and r[k] > b[k] * (1 + a.tolerance):
+                    bad.append(f"{name}.p50: {r[k]:.2f} ms vs baseline {b[k]:.2f} ms ({d:+.0f}%)")
+        if bad:
+            print("REGRESSION (tolerance {:.0f}%):".format(a.tolerance * 100))
+            for ln in bad:
+                print("  " + ln)
+            sys.exit(1)
+        print(f"ok: within {a.tolerance * 100:.0f}% of {a.baseline}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PIPELINED RENDERING — in-process vs RenderWorker
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_pipe(a):
+    """Throughput (frames/s through sim + scene + raster) and latency (start
+    of a frame's simulation to its pixels being available to present)."""
+    import warnings
+    warnings.simplefilter("ignore")
+    print(f"pipe: {os.cpu_count()} CPU(s)")
+    for worker in (False, True):
+        g = rr.Game(worker=worker)
+        pf = g.prof
+        for name in a.scenario or ['race', 'traffic']:
+            setup(g, name, a.seed)
+            starts, lat = [], []
+            for n in range(a.warmup + a.frames + 1):
+                if n == a.warmup:
+                    t0 = time.perf_counter()
+                    lat.clear()
+                starts.append(time.perf_counter())
+                advance(g)
+                sc = g._scene()
+                if worker:
+                    g.rw.swap(sc)
+                    if n:
+                        lat.append((time.perf_counter() - starts[n - 1]) * 1e3)
+                else:
+                    g.cv.raster(sc, pf)
+                    lat.append((time.perf_counter() - starts[n]) * 1e3)
+            el = time.perf_counter() - t0
+            mode = "worker" if worker else "single"
+            print(f"pipe[{mode}] {name:8} {(a.frames + 1) / el:7.1f} fps   latency p50 "
+                  f"{rr.pct(lat, 50):6.2f}  p95 {rr.pct(lat, 95):6.2f} ms")
+        g._quit()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ROAD FILL — polygon strips vs numpy scanline spans
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_fill(a):
+    """Road strip cost per frame for each fill on the same scenes: a raster
+    of the strips alone minus a raster with no strips (sky, HUD)."""
+    import warnings
+    warnings.simplefilter("ignore")
+    if rr.np is None:
+        print("fill: numpy not installed, the scan fill falls back to polygons")
+        return
+    np = rr.np
+    g = rr.Game()
+    pf = g.prof
+    for name in a.scenario or ['title', 'race']:
+        setup(g, name, a.seed)
+        if a.endless is not None:
+            g.road = rr.Track(a.endless)
+        ts = {k: [] for k in ('none',) + rr.ROAD_FILLS}
+        empty = rr.SpriteQueue()
+        strips = diff = 0
+        for n in range(a.frames):
+            advance(g)
+            st, quads, _, _ = g._scene()
+            strips += len(quads)
+            shot = {}
+            for fill, qs in (('none', []), ('poly', quads), ('scan', quads)):
+                rr.random.seed(n)       # same speed lines and flames in each shot
+                t0 = time.perf_counter()
+                g.cv.raster((dict(st, fill=fill), qs, empty, None), pf)
+                ts[fill].append((time.perf_counter() - t0) * 1e3)
+                shot[fill] = rr.pygame.surfarray.array2d(g.scr)
+            diff += np.count_nonzero(shot['poly'] != shot['scan']) / shot['poly'].size
+        base = rr.pct(ts['none'], 50)
+        for fill in rr.ROAD_FILLS:
+            print(f"fill[{name:6}] {fill}  road p50 {rr.pct(ts[fill], 50) - base:6.2f} ms  "
+                  f"p95 {rr.pct(ts[fill], 95) - base:6.2f} ms")
+        print(f"    {strips / a.frames:.0f} strips/frame, {100 * diff / a.frames:.2f}% pixels "
+              "differ (edge rounding)")
+    g._quit()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LAUNCH — time to first frame, fresh process vs warm host
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_launch(a):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roadrash.py")
+    cold = []
+    for _ in range(a.reps):
+        p = subprocess.Popen([sys.executable, script, "--t0", repr(time.time())],
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for ln in p.stdout:
+            if ln.startswith("first frame"):
+                cold.append(float(ln.split()[2]))
+                break
+        p.terminate()
+        p.wait()
+    if not hasattr(os, 'fork'):
+        print(f"launch[cold] p50 {rr.pct(cold, 50):7.1f} ms  (no fork here: the warm host "
+              "runs games in-process, one at a time)")
+        return
+    t0 = time.time()
+    env = {k: v for k, v in os.environ.items() if k != "ROADRASH_HOST_KEY"}
+    h = subprocess.Popen([sys.executable, script, "--host"], env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    # host: ready on ADDR key KEY (a private socket and a generated key)
+    addr, key = h.stdout.readline().strip()[len("host: ready on "):].rsplit(" key ", 1)
+    ready = (time.time() - t0) * 1e3
+    warm = []
+    try:
+        for _ in range(a.reps):
+            with rr.launch([], addr, key) as conn:
+                _, pid = conn.recv()
+                warm.append(conn.recv()[1])
+            os.kill(pid, signal.SIGTERM)
+            time.sleep(0.05)
+    finally:
+        with rr.Client(addr, authkey=key.encode()) as conn:
+            conn.send(('stop',))
+            conn.recv()
+        h.wait()
+    print(f"launch[cold] p50 {rr.pct(cold, 50):7.1f} ms  max {max(cold):7.1f} ms  (new interpreter)")
+    print(f"launch[warm] p50 {rr.pct(warm, 50):7.1f} ms  max {max(warm):7.1f} ms  "
+          f"(fork of a host that was ready after {ready:.0f} ms)")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STARTUP — launcher time to window, cold vs warm
+# ═══════════════════════════════════════════════════════════════════════════════
+def startup_run(cmd, env):
+    """Phase -> ms from one `main.py --profile-startup` run (see main.Startup)."""
+    p = subprocess.run(cmd + ["--profile-startup", "--t0", repr(time.time())],
+                       capture_output=True, text=True, env=env)
+    ph = {}
+    for ln in p.stdout.splitlines():
+        if ln.startswith("startup "):
+            f = ln.split()
+            ph[f[1]] = float(f[2])
+    if not ph:
+        sys.exit(f"startup: {' '.join(cmd)} failed: {(p.stderr.strip().splitlines() or ['?'])[-1]}")
+    ph['error'] = p.returncode and (p.stderr.strip().splitlines() or ['?'])[-1]
+    return ph
+
+
+def startup_row(name, runs):
+    phases = [k for k in runs[0] if k != 'error']
+    print(f"startup[{name}] " + "  ".join(
+        f"{k} {rr.pct([r.get(k, 0) for r in runs], 50):.1f}" for k in phases) + " ms (p50)")
+
+
+def bench_startup(a):
+    here = os.path.dirname(os.path.abspath(__file__))
+    cmd = [a.exe] if a.exe else [sys.executable, os.path.join(here, "main.py")]
+    base = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cold: nothing compiled yet (a fresh bytecode cache per run, as on the
+        # first launch after install); a frozen build only has its first run.
+        cold = []
+        for k in range(1 if a.exe else a.reps):
+            env = dict(base) if a.exe else \
+                dict(base, PYTHONPYCACHEPREFIX=os.path.join(tmp, f"cold{k}"))
+            cold.append(startup_run(cmd, env))
+        env = dict(base, PYTHONPYCACHEPREFIX=os.path.join(tmp, "warm"))
+        startup_run(cmd, env)
+        warm = [startup_run(cmd, env) for _ in range(a.reps)]
+        imports = []
+        if not a.exe and a.imports:
+            p = subprocess.run([sys.executable, "-X", "importtime"] + cmd[1:] + ["--profile-startup"],
+                               capture_output=True, text=True, env=env)
+            for ln in p.stderr.splitlines():
+                f = ln.split("|")
+                if ln.startswith("import time:") and f[1].strip().isdigit() \
+                        and not f[2].startswith("  "):      # top level only
+                    imports.append((int(f[1]), f[2].strip()))
+    startup_row("cold", cold)
+    startup_row("warm", warm)
+    print("startup: `args` is argparse for --profile-startup; a launch without flags skips it")
+    if imports:
+        print("startup: top imports (cumulative, warm cache): " + "  ".join(
+            f"{m} {us / 1e3:.1f}" for us, m in sorted(imports, reverse=True)[:a.imports]) + " ms")
+    if warm[-1]['error']:
+        print(f"startup: no window ({warm[-1]['error']}); phases stop there")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("sim", help="headless physics/collision ticks per second")
+    p.add_argument("--races", type=int, default=200)
+    p.add_argument("--ticks", type=int, default=3600)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(fn=bench_sim)
+
+    p = sub.add_parser("proj", help="per-frame road projection cost, python vs numpy")
+    p.add_argument("--frames", type=int, default=5000)
+    p.set_defaults(fn=bench_proj)
+
+    p = sub.add_parser("lanes", help="collision query cost vs rider count, scan vs lane index")
+    p.add_argument("--queries", type=int, default=2000)
+    p.add_argument("--counts", default="30,300,3000,30000,300000")
+    p.set_defaults(fn=bench_lanes)
+
+    p = sub.add_parser("riders", help="batched rider movement + re-bucket cost per tick")
+    p.add_argument("--ticks", type=int, default=120)
+    p.add_argument("--counts", default="30,300,3000,30000")
+    p.set_defaults(fn=bench_riders)
+
+    p = sub.add_parser("track", help="streamed track: startup, per-segment cost, memory window")
+    p.add_argument("--segments", type=int, default=200000)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(fn=bench_track)
+
+    p = sub.add_parser("load", help="track file export size and mmap vs JSON load time")
+    p.add_argument("--segments", type=int, default=1000000)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(fn=bench_load)
+
+    p = sub.add_parser("pipe", help="render worker vs in-process: throughput and latency")
+    p.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    p.add_argument("--frames", type=int, default=300)
+    p.add_argument("--warmup", type=int, default=30)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(fn=bench_pipe)
+
+    p = sub.add_parser("fill", help="road strips: polygon vs numpy scanline fill")
+    p.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    p.add_argument("--frames", type=int, default=300)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--endless", type=int, metavar="SEED", help="race Track(SEED) instead")
+    p.set_defaults(fn=bench_fill)
+
+    p = sub.add_parser("launch", help="time to first frame: fresh process vs warm host")
+    p.add_argument("--reps", type=int, default=5)
+    p.set_defaults(fn=bench_launch)
+
+    p = sub.add_parser("startup", help="launcher time to window by phase, cold vs warm")
+    p.add_argument("--reps", type=int, default=5)
+    p.add_argument("--exe", metavar="PATH", help="time a build from build.sh instead of main.py")
+    p.add_argument("--imports", type=int, default=8, metavar="N",
+                   help="list the N slowest top-level imports (source only)")
+    p.set_defaults(fn=bench_startup)
+
+    p = sub.add_parser("frame", help="offscreen Game._drw render suite")
+    p.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                   help="run only this scenario (repeatable); default all")
+    p.add_argument("--frames", type=int, default=600)
+    p.add_argument("--warmup", type=int, default=60)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--stages", action="store_true", help="per-stage breakdown")
+    p.add_argument("--count", action="store_true", help="also count draw calls and surfaces")
+    p.add_argument("--scale", type=float, default=1.0,
+                   help="internal render scale (upscale cost is the 'scale' stage)")
+    p.add_argument("--lod-bias", type=float, default=1.0,
+                   help="scale the LOD thresholds (0 = full detail everywhere)")
+    p.add_argument("--assets", action="store_true",
+                   help="bitmap bikes and textured road instead of procedural drawing")
+    p.add_argument("--road-fill", choices=rr.ROAD_FILLS, default='poly')
+    p.add_argument("--save", metavar="JSON", help="write results as a baseline")
+    p.add_argument("--baseline", metavar="JSON", help="fail if slower than this baseline")
+    p.add_argument("--tolerance", type=float, default=0.25,
+                   help="allowed p50 slowdown vs baseline (default 0.25)")
+    p.set_defaults(fn=bench_frame)
+
+    a = ap.parse_args(argv)
+    a.fn(a)
+
+
+if __name__ == "__main__":
+    main()
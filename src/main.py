@@ -1,15 +1,148 @@
 import sys
 import os
+import time
+import types
+T_MAIN = time.time()            # interpreter up, launcher module running
 # Make sure sibling modules (roadrash, tictactoe) are always importable
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+# Everything else (argparse, subprocess, tkinter, the games, the warm host's
+# socket code) is imported where it is first used, so `--roadrash`/`--host`
+# never load Tk and the launcher window does not wait for modules nobody
+# has clicked yet.
 
-import tkinter as tk
-from tkinter import ttk
-from tictactoe import TicTacToe
 
+def proc_start(pid='self'):
+    """Epoch time process pid started (Linux /proc, 10 ms ticks), else None."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            up = float(f.read().split()[0])
+        return time.time() - (up - ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, AttributeError):
+        return None
 
-def main():
-    root = tk.Tk()
+
+class Startup:
+    """--profile-startup: time from process start to the launcher window
+    being mapped, split into phases, printed as `startup <phase> <ms>` lines.
+    Process start is --t0 when given, else read from /proc; a one-file build
+    counts from its bootloader (the parent), so unpacking shows up in the
+    `interpreter` phase. `args` is argparse, which a launch without flags
+    skips. None of it runs without the flag."""
+    def __init__(self, t0=None, t_args=None):
+        if t0 is None and getattr(sys, 'frozen', False) and \
+                os.path.basename(getattr(sys, '_MEIPASS', '')).startswith('_MEI'):
+            t0 = proc_start(os.getppid())
+        self.t0 = t0 or proc_start() or T_MAIN
+        self.marks = [('interpreter', T_MAIN), ('main.py', t_args or T_MAIN), ('args', time.time())]
+        self.mods = len(sys.modules)
+
+    def mark(self, phase):
+        self.marks.append((phase, time.time()))
+
+    def report(self):
+        t = self.t0
+        for phase, at in self.marks:
+            print(f"startup {phase:12} {(at - t) * 1e3:8.1f} ms")
+            t = at
+        print(f"startup {'total':12} {(t - self.t0) * 1e3:8.1f} ms  "
+              f"({len(sys.modules) - self.mods} more modules imported for the window)", flush=True)
+
+
+def game_cmd(*args):
+    """Command line that runs roadrash.py with args, from source or from the
+    one-file build (which runs it through main(['--roadrash', ...]))."""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, '--roadrash', *args]
+    return [sys.executable, os.path.join(HERE, "roadrash.py"), *args]
+
+
+class WarmHost:
+    """A roadrash --host process started with the launcher: pygame imported,
+    fonts looked up and a course built before the first click. Launches
+    fork from it; see roadrash.host()."""
+    def __init__(self):
+        import secrets
+        import tempfile
+        import subprocess
+        # same scheme as roadrash.host_addr(), without importing pygame here
+        self.addr = (rf'\\.\pipe\roadrash-{secrets.token_hex(8)}' if os.name == 'nt' else
+                     os.path.join(tempfile.mkdtemp(prefix="roadrash-"), "host.sock"))
+        self.key = secrets.token_hex(16)
+        self.proc = subprocess.Popen(game_cmd('--host', self.addr), stdout=subprocess.DEVNULL,
+                                     env=dict(os.environ, ROADRASH_HOST_KEY=self.key))
+
+    def launch(self, t0):
+        """Connection that will report ('first_frame', ms), or None when the
+        host is not (or no longer) up."""
+        from multiprocessing.connection import Client
+        if self.proc.poll() is not None:
+            return None
+        try:
+            conn = Client(self.addr, authkey=self.key.encode())
+            conn.send(('launch', [], t0))
+            conn.recv()             # ('started', pid)
+            return conn
+        except (OSError, EOFError):
+            return None
+
+    def stop(self):
+        import subprocess
+        from multiprocessing.connection import Client
+        try:
+            with Client(self.addr, authkey=self.key.encode()) as conn:
+                conn.send(('stop',))
+                conn.recv()
+        except (OSError, EOFError):
+            pass
+        try:
+            self.proc.wait(2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        if os.name != 'nt':
+            import shutil
+            shutil.rmtree(os.path.dirname(self.addr), ignore_errors=True)
+
+
+def parse_args(argv):
+    if not argv:                # plain launch: not worth importing argparse for
+        return types.SimpleNamespace(warm=False, profile_startup=False, t0=None)
+    import argparse
+    ap = argparse.ArgumentParser(description="Game Launcher")
+    ap.add_argument("--warm", action="store_true",
+                    help="keep a warm Road Rash host so games start in a fraction of the time")
+    ap.add_argument("--profile-startup", action="store_true",
+                    help="print time-to-window by phase, then close the launcher")
+    ap.add_argument("--t0", type=float, metavar="EPOCH",
+                    help="count startup from this time.time() (set by the caller)")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--roadrash']:      # one-file build: run the game itself
+        import roadrash
+        return roadrash.main(argv[1:])
+    t_args = time.time()
+    a = parse_args(argv)
+    prof = Startup(a.t0, t_args) if a.profile_startup else None
+    host = WarmHost() if a.warm else None
+    done = []       # (mode, first-frame ms), appended by the reporting threads
+    polling = False             # status updates start with the first Road Rash launch
+
+    import tkinter as tk
+    if prof:
+        prof.mark('tkinter')
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        if prof:
+            prof.report()   # headless: the import phases are still worth having
+        raise
+    if prof:
+        prof.mark('Tk()')
     root.title("Game Launcher")
     root.geometry("400x360")
     root.configure(bg="#1a1a2e")
@@ -55,13 +188,43 @@ def main():
         card.bind("<Leave>", on_leave)
 
     def open_tictactoe():
+        from tictactoe import TicTacToe
         game = TicTacToe(root)
         game.grab_set()
 
     def open_roadrash():
+        nonlocal polling
+        import threading
         import subprocess
-        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roadrash.py")
-        subprocess.Popen([sys.executable, script])
+        t0 = time.time()
+        if not polling:
+            polling = True
+            show_launch()
+        conn = host.launch(t0) if host else None
+        if conn is not None:
+            threading.Thread(target=wait_warm, args=(conn,), daemon=True).start()
+            return
+        proc = subprocess.Popen(game_cmd('--t0', repr(t0)), stdout=subprocess.PIPE, text=True)
+        threading.Thread(target=wait_cold, args=(proc,), daemon=True).start()
+
+    def wait_warm(conn):
+        try:
+            done.append(('warm', conn.recv()[1]))
+        except (OSError, EOFError):
+            pass
+        conn.close()
+
+    def wait_cold(proc):
+        for ln in proc.stdout:
+            if ln.startswith("first frame"):
+                done.append(('cold', float(ln.split()[2])))
+                break
+
+    def show_launch():
+        while done:
+            mode, ms = done.pop(0)
+            status.configure(text=f"Road Rash: first frame in {ms:.0f} ms ({mode} start)")
+        root.after(200, show_launch)
 
     make_card(root, "✖", "Tic-Tac-Toe",
               "Classic 2-player strategy game",
@@ -72,16 +235,34 @@ def main():
               open_roadrash)
 
     # Footer
-    tk.Label(root, text="Press ▶ Play to launch a game",
-             fg="#555", bg="#1a1a2e", font=("Helvetica", 9)).pack(pady=(10, 0))
+    status = tk.Label(root, text="Press ▶ Play to launch a game",
+                      fg="#555", bg="#1a1a2e", font=("Helvetica", 9))
+    status.pack(pady=(10, 0))
 
     tk.Button(root, text="Quit", bg="#333", fg="white",
               relief="flat", padx=10, pady=4,
               command=root.quit).pack(pady=10)
 
     root.eval("tk::PlaceWindow . center")
-    root.mainloop()
+    if prof:
+        prof.mark('widgets')
+
+        def mapped(_):
+            if prof.marks[-1][0] == 'widgets':
+                root.update_idletasks()         # first layout/paint requests handled
+                prof.mark('window')
+                prof.report()
+                root.after(1, root.quit)
+        root.bind("<Map>", mapped)
+    try:
+        root.mainloop()
+    finally:
+        if host:
+            host.stop()
 
 
 if __name__ == "__main__":
+    if getattr(sys, 'frozen', False):   # the one-file build spawns --worker processes
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
@@ -0,0 +1,189 @@
+"""
+Road Rash replays — re-run recorded races (roadrash.py --record PATH).
+
+  python src/replay.py play   FILE... [--jobs N] [--repeat N]
+                              [--save JSON] [--baseline JSON] [--tolerance F]
+  python src/replay.py render FILE... [--out DIR] [--every N] [--size WxH] [--scale K]
+  python src/replay.py make   DIR [--count N] [--races N] [--ticks N] [--seed S] [--endless]
+
+play re-simulates headlessly at full speed and fails if any race ends in a
+different state than it was recorded with (bug reproduction, determinism),
+or, with --baseline, if a file replays slower (corpus performance gate).
+render writes every Nth tick as PNGs. Files are spread over a process pool.
+make writes a synthetic corpus (weaving riders) without a window.
+"""
+import sys, os, math, time, json, argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import roadrash as rr
+
+
+def pool_map(fn, jobs, n):
+    """fn over jobs on n processes (in-process when n == 1, for debugging)."""
+    if n == 1 or len(jobs) == 1:
+        return [fn(j) for j in jobs]
+    with rr.mp.get_context('spawn').Pool(min(n, len(jobs))) as pool:
+        return pool.map(fn, jobs, chunksize=1)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HEADLESS PLAYBACK
+# ═══════════════════════════════════════════════════════════════════════════════
+def play_file(job):
+    path, repeat = job
+    meta, races = rr.load_replay(path)
+    sim = rr.Sim(None, rr.course_road(meta['course']), meta['riders'])
+    dt = 1.0 / meta['hz']
+    bad = []
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for n, race in enumerate(races):
+            end = rr.replay(sim, race, dt)
+            if end != race['end'] and n not in bad:
+                bad.append(n)
+    el = time.perf_counter() - t0
+    ticks = repeat * sum(len(r['inputs']) for r in races)
+    return path, {'races': len(races), 'ticks': ticks, 's': el,
+                  'tps': ticks / max(el, 1e-9), 'diverged': bad}
+
+
+def cmd_play(a):
+    t0 = time.perf_counter()
+    res = dict(pool_map(play_file, [(p, a.repeat) for p in a.files], a.jobs))
+    el = time.perf_counter() - t0
+    ticks = sum(r['ticks'] for r in res.values())
+    bad = []
+    for path, r in res.items():
+        print(f"play[{os.path.basename(path)}] {r['races']:4} races {r['ticks']:9} ticks  "
+              f"{r['tps']:10,.0f} ticks/s" + (f"  DIVERGED {r['diverged']}" if r['diverged'] else ""))
+        if r['diverged']:
+            bad.append(f"{path}: races {r['diverged']} end in a different state")
+    print(f"play: {len(res)} files, {ticks} ticks in {el:.2f}s on {a.jobs} process(es)  "
+          f"{ticks / el:,.0f} ticks/s")
+    if a.save:
+        with open(a.save, 'w') as f:
+            json.dump(res, f, indent=2)
+        print(f"saved baseline -> {a.save}")
+    if a.baseline:
+        with open(a.baseline) as f:
+            base = json.load(f)
+        for path, r in res.items():
+            b = base.get(path)
+            if b is None:
+                continue
+            d = (r['tps'] / b['tps'] - 1) * 100
+            if r['tps'] < b['tps'] * (1 - a.tolerance):
+                bad.append(f"{path}: {r['tps']:,.0f} ticks/s vs baseline {b['tps']:,.0f} ({d:+.0f}%)")
+    if bad:
+        print("FAILED:")
+        for ln in bad:
+            print("  " + ln)
+        sys.exit(1)
+    print("ok" + (f": within {a.tolerance * 100:.0f}% of {a.baseline}" if a.baseline else ""))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OFFSCREEN RENDERING
+# ═══════════════════════════════════════════════════════════════════════════════
+def render_file(job):
+    import warnings
+    warnings.simplefilter("ignore")         # SysFont complains without fc-list
+    path, out, every, size, scale = job
+    meta, races = rr.load_replay(path)
+    g = rr.Game(size=size, scale=scale, road=rr.course_road(meta['course']))
+    g.n_riders = meta['riders']
+    stem = os.path.splitext(os.path.basename(path))[0]
+    frames = 0
+
+    def shot(sim):
+        nonlocal frames
+        if sim.ticks % every == 0 or sim.dead:
+            g._drw()
+            g._compose()
+            rr.pygame.image.save(g.win, os.path.join(out, f"{stem}_r{n:03}_{sim.ticks:06}.png"))
+            frames += 1
+
+    for n, race in enumerate(races):
+        rr.random.seed(race['seed'])        # speed lines and flames use the global RNG
+        g.spr.clear()
+        rr.replay(g, race, 1.0 / meta['hz'], shot)
+    rr.pygame.quit()
+    return path, frames
+
+
+def cmd_render(a):
+    os.makedirs(a.out, exist_ok=True)
+    every = a.every or max(1, round(rr.SIM_HZ / rr.FPS))
+    t0 = time.perf_counter()
+    res = pool_map(render_file, [(p, a.out, every, a.size, a.scale) for p in a.files], a.jobs)
+    n = sum(f for _, f in res)
+    print(f"render: {n} frames from {len(res)} files -> {a.out} in {time.perf_counter() - t0:.1f}s")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SYNTHETIC CORPUS
+# ═══════════════════════════════════════════════════════════════════════════════
+def cmd_make(a):
+    os.makedirs(a.dir, exist_ok=True)
+    road = rr.Track(a.seed) if a.endless else rr.course_road(['ring', a.seed])
+    for k in range(a.count):
+        path = os.path.join(a.dir, f"synth_{k:04}.rrp")
+        sim = rr.Sim(None, road)
+        rec = rr.Recorder(path, road, rr.SIM_HZ, sim.n_riders)
+        dt = 1.0 / rr.SIM_HZ
+        for r in range(a.races):
+            seed = a.seed * 1000 + k * a.races + r
+            sim.reset(seed)
+            sim.go = True
+            rec.start(seed)
+            w = 0.02 + 0.01 * (seed % 7)        # each race weaves at its own rate
+            while sim.ticks < a.ticks and not sim.dead:
+                inp = (True, False, int(round(math.sin(sim.ticks * w))))
+                sim.step(dt, inp)
+                rec.tick(inp)
+            rec.end(sim)
+        rec.close(sim)
+        print(f"{path}: {os.path.getsize(path)} bytes")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("play", help="re-simulate headlessly, verify end states, time it")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    p.add_argument("--repeat", type=int, default=1, help="replay each file N times (timing)")
+    p.add_argument("--save", metavar="JSON", help="write ticks/s per file as a baseline")
+    p.add_argument("--baseline", metavar="JSON", help="fail if slower than this baseline")
+    p.add_argument("--tolerance", type=float, default=0.25,
+                   help="allowed ticks/s drop vs baseline (default 0.25)")
+    p.set_defaults(fn=cmd_play)
+
+    p = sub.add_parser("render", help="re-render replays offscreen to PNG sequences")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--out", default="frames")
+    p.add_argument("--every", type=int, default=0,
+                   help=f"save every Nth tick (default {rr.SIM_HZ}/{rr.FPS})")
+    p.add_argument("--size", metavar="WxH", default=f"{rr.W}x{rr.H}", type=rr.size_arg)
+    p.add_argument("--scale", type=float, default=1.0)
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    p.set_defaults(fn=cmd_render)
+
+    p = sub.add_parser("make", help="record a synthetic corpus headlessly")
+    p.add_argument("dir")
+    p.add_argument("--count", type=int, default=8, help="files")
+    p.add_argument("--races", type=int, default=4, help="races per file")
+    p.add_argument("--ticks", type=int, default=rr.SIM_HZ * 60, help="tick cap per race")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--endless", action="store_true", help="race Track(seed) instead of the ring")
+    p.set_defaults(fn=cmd_make)
+
+    a = ap.parse_args(argv)
+    a.fn(a)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,20 @@ All bikes/riders drawn programmatically every frame with:
   • Dynamic exhaust flames at high speed
   • Smooth curves, hills, roadside scenery
 """
-import sys, os, math, random, time
+import sys, os, math, random, json, time, argparse, mmap, struct, zlib, tempfile, secrets, stat
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.connection import Listener, Client
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import pygame
+import pygame.gfxdraw
+try:
+    import numpy as np
+except ImportError:     # optional: vectorized projection falls back to pure Python
+    np = None
 
 W, H    = 800, 600
 FPS     = 60
@@ -21,18 +32,32 @@ N_SEG   = 300
 DRAW_D  = 150
 CAM_D   = 0.84
 HOR     = int(H * 0.38)
+RIDERS  = 30
 
 
 def fog(c, f):
     return tuple(max(0, min(255, int(c[i] + f * (175 - c[i])))) for i in range(3))
 
 
+# Road-pass palette, indexed by `alt` (even segment) where paired
+GRASS_C = ((30, 120, 30), (20, 90, 20))
+ROAD_C  = ((62, 62, 62), (44, 44, 44))
+KERB_C  = ((230, 230, 230), (220, 30, 30))
+DASH_C  = (255, 255, 255)
+RAIL_C  = (160, 160, 170)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # ANIMATED BIKE RENDERER — draws everything in real-time each frame
 # ═══════════════════════════════════════════════════════════════════════════════
 def draw_bike(surf, cx, by, scale, lean, wheel_angle, speed_ratio,
-              body_col=(30, 100, 220), is_player=True):
-    """Draw a fully animated motorbike + rider at (cx, by) with given scale."""
+              body_col=(30, 100, 220), is_player=True, flames=True, lod=0):
+    """Draw a fully animated motorbike + rider at (cx, by) with given scale.
+
+    lod 1 drops the details that are a pixel or two at that size (spokes,
+    engine lines, mirrors, stripe, glass); lod 2 is a flat impostor of
+    wheel, fairing, tail light and rider.
+    """
     if scale < 0.06:
         return
     s = scale
@@ -41,15 +66,19 @@ def draw_bike(surf, cx, by, scale, lean, wheel_angle, speed_ratio,
     lx = int(lean * 22 * s)
 
     # ── Shadow ──
-    sw = int(65 * s)
-    sh_s = pygame.Surface((sw * 2, int(sw * 0.4)), pygame.SRCALPHA)
-    pygame.draw.ellipse(sh_s, (0, 0, 0, 50), sh_s.get_rect())
-    surf.blit(sh_s, (cx - sw + lx // 2, by + int(3 * s)))
+    if lod < 2:
+        sw = int(65 * s)
+        sh_s = pygame.Surface((sw * 2, int(sw * 0.4)), pygame.SRCALPHA)
+        pygame.draw.ellipse(sh_s, (0, 0, 0, 50), sh_s.get_rect())
+        surf.blit(sh_s, (cx - sw + lx // 2, by + int(3 * s)))
 
     # ── Rear Wheel (with spinning spokes) ──
     wr = max(3, int(22 * s))
     wcx, wcy = cx + lx, by
     pygame.draw.circle(surf, (30, 30, 30), (wcx, wcy), wr)           # tyre
+    if lod:
+        _bike_lo(surf, cx, by, s, lx, speed_ratio, body_col, lod)
+        return
     pygame.draw.circle(surf, (50, 50, 50), (wcx, wcy), max(2, wr - int(4 * s)))  # inner
     # spokes (animated!)
     n_spokes = 6
@@ -85,14 +114,8 @@ def draw_bike(surf, cx, by, scale, lean, wheel_angle, speed_ratio,
     pygame.draw.line(surf, (160, 140, 100), (cx + lx + ew // 2, ex_y),
                      (ex_x + int(12 * s), by + int(5 * s)), max(1, int(4 * s)))
     # Exhaust flame at high speed
-    if speed_ratio > 0.5 and is_player:
-        flame_len = int(10 * s * speed_ratio)
-        for fi in range(3):
-            fx = ex_x + int(12 * s) + random.randint(0, flame_len)
-            fy = by + int(5 * s) + random.randint(-int(3 * s), int(3 * s))
-            fr = max(1, int((3 - fi) * s))
-            cols = [(255, 100, 20), (255, 180, 30), (255, 220, 80)]
-            pygame.draw.circle(surf, cols[fi], (fx, fy), fr)
+    if flames and speed_ratio > 0.5 and is_player:
+        draw_flames(surf, cx, by, s, lean, speed_ratio)
 
     # ── Main body / fairing ──
     body_pts = [
@@ -190,19 +213,61 @@ def draw_bike(surf, cx, by, scale, lean, wheel_angle, speed_ratio,
         surf.blit(glow_s, (cx + lx - int(10 * s), hl_y))
 
 
+def _bike_lo(surf, cx, by, s, lx, speed_ratio, body_col, lod):
+    """Reduced bike above the tyre for draw_bike lod 1 and 2."""
+    pygame.draw.circle(surf, (180, 180, 180), (cx + lx, by), max(1, int(4 * s)))
+    if lod == 1:
+        ew, eh = int(28 * s), int(18 * s)
+        pygame.draw.rect(surf, (60, 60, 70), (cx + lx - ew // 2, by - int(18 * s), ew, eh))
+    pygame.draw.polygon(surf, body_col, [
+        (cx - int(24 * s) + lx, by - int(18 * s)),
+        (cx + int(24 * s) + lx, by - int(18 * s)),
+        (cx + int(18 * s) + lx, by - int(58 * s)),
+        (cx - int(18 * s) + lx, by - int(58 * s)),
+    ])
+    tl_w = max(2, int(16 * s))
+    tl_col = (255, 30, 30) if speed_ratio < 0.3 else (255, 80, 80)
+    pygame.draw.rect(surf, tl_col, (cx + lx - tl_w // 2, by - int(20 * s), tl_w, max(1, int(5 * s))))
+    if lod == 1:
+        hb_y, hb_w = by - int(68 * s), int(28 * s)
+        pygame.draw.line(surf, (160, 160, 160), (cx - hb_w + lx, hb_y), (cx + hb_w + lx, hb_y),
+                         max(1, int(3 * s)))
+    torso_y = by - int(78 * s)
+    torso_w = int(24 * s)
+    pygame.draw.rect(surf, (40, 40, 45), (cx + lx - torso_w // 2, torso_y, torso_w, int(22 * s)))
+    hy, hr = torso_y - int(14 * s), max(3, int(16 * s))
+    pygame.draw.circle(surf, (40, 40, 40), (cx + lx, hy), hr)
+    if lod == 1:
+        pygame.draw.ellipse(surf, (70, 140, 200), (cx + lx - int(hr * 0.75), hy - int(hr * 0.3),
+                                                   int(hr * 1.5), int(hr * 0.6)))
+
+
+def draw_flames(surf, cx, by, s, lean, speed_ratio):
+    """Flickering exhaust flame; kept separate so cached bikes can add it live."""
+    ex_x = cx + int(lean * 22 * s) + int(22 * s)
+    flame_len = int(10 * s * speed_ratio)
+    for fi in range(3):
+        fx = ex_x + int(12 * s) + random.randint(0, flame_len)
+        fy = by + int(5 * s) + random.randint(-int(3 * s), int(3 * s))
+        fr = max(1, int((3 - fi) * s))
+        cols = [(255, 100, 20), (255, 180, 30), (255, 220, 80)]
+        pygame.draw.circle(surf, cols[fi], (fx, fy), fr)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SCENERY DRAWING
 # ═══════════════════════════════════════════════════════════════════════════════
-def draw_tree(s, x, y, sc, f):
+def draw_tree(s, x, y, sc, f, lod=0):
     if sc < 0.02: return
     th, tw, cr = max(2, int(70*sc)), max(1, int(12*sc)), max(2, int(38*sc))
     pygame.draw.rect(s, fog((100, 60, 25), f), (x-tw//2, y-th, tw, th))
     pygame.draw.circle(s, fog((15, 110, 15), f), (x, y-th), cr)
+    if lod: return
     pygame.draw.circle(s, fog((25, 140, 25), f), (x-cr//3, y-th-cr//3), int(cr*0.6))
     pygame.draw.circle(s, fog((20, 125, 20), f), (x+cr//4, y-th+cr//4), int(cr*0.45))
 
 
-def draw_lamp(s, x, y, sc, f):
+def draw_lamp(s, x, y, sc, f, lod=0):
     if sc < 0.03: return
     ph, pw = max(4, int(85*sc)), max(1, int(5*sc))
     arm = max(2, int(22*sc))
@@ -210,100 +275,955 @@ def draw_lamp(s, x, y, sc, f):
     pygame.draw.line(s, fog((150, 150, 160), f), (x, y-ph), (x+arm, y-ph), pw)
     lr = max(2, int(7*sc))
     pygame.draw.circle(s, fog((240, 220, 120), f), (x+arm, y-ph), lr)
+    if lod: return
     # Glow
     gs = pygame.Surface((lr*4, lr*4), pygame.SRCALPHA)
     pygame.draw.circle(gs, (255, 240, 150, 40), (lr*2, lr*2), lr*2)
     s.blit(gs, (x+arm-lr*2, y-ph-lr*2))
 
 
-def draw_bldg(s, x, y, sc, f, ci=0):
+BLDG_COLS = [(65, 45, 85), (85, 55, 105), (55, 65, 45), (70, 55, 45)]
+# Window slots (x, y) in building units (130 x 200), 11 x 14 each
+BLDG_WIN = [(wx, wy) for wx in range(11, 119, 33) for wy in range(18, 186, 42)]
+
+
+def window_mask(seed):
+    """Lit-window bitmask for one building; 3 in 4 windows are lit."""
+    r = random.Random(seed)
+    return sum(1 << n for n in range(len(BLDG_WIN)) if r.random() > 0.25)
+
+
+def draw_bldg(s, x, y, sc, f, ci=0, win=0):
     if sc < 0.03: return
     bw, bh = max(4, int(130*sc)), max(6, int(200*sc))
-    cols = [(65, 45, 85), (85, 55, 105), (55, 65, 45), (70, 55, 45)]
-    pygame.draw.rect(s, fog(cols[ci%4], f), (x-bw//2, y-bh, bw, bh))
+    x0, y0 = x-bw//2, y-bh
+    if not s.get_clip().colliderect((x0, y0, bw, bh)): return
+    pygame.draw.rect(s, fog(BLDG_COLS[ci%4], f), (x0, y0, bw, bh))
     # Roof edge
-    pygame.draw.line(s, fog((100, 80, 60), f), (x-bw//2, y-bh), (x+bw//2, y-bh),
-                     max(1, int(3*sc)))
-    # Windows
+    pygame.draw.line(s, fog((100, 80, 60), f), (x0, y0), (x0+bw, y0), max(1, int(3*sc)))
+    # Windows (lit per the segment's mask), plain rects at any size
+    lit, dark = fog((220, 210, 150), f), fog((80, 70, 50), f)
     wr, wh = max(1, int(11*sc)), max(1, int(14*sc))
-    for wx in range(x-bw//2+wr, x+bw//2-wr, wr*3):
-        for wy in range(y-bh+wh+int(4*sc), y-wh, wh*3):
-            wc = (220, 210, 150) if random.random() > 0.25 else (80, 70, 50)
-            pygame.draw.rect(s, fog(wc, f), (wx, wy, wr, wh))
+    for n, (wx, wy) in enumerate(BLDG_WIN):
+        pygame.draw.rect(s, lit if win >> n & 1 else dark, (x0+int(wx*sc), y0+int(wy*sc), wr, wh))
+
+
+SCENERY_FN  = {'T': draw_tree, 'L': draw_lamp, 'B': draw_bldg}
+SCENERY_MIN = {'T': 0.02, 'L': 0.03, 'B': 0.03}     # below this scale: not drawn
+
+# Level-of-detail thresholds on projected scale: a sprite at or above th[n]
+# but below th[n-1] is drawn at lod n (0 = full detail). Sprites project at
+# 2000*CAM_D/depth (x0.8 for bikes) and only the far end of the draw distance
+# lands on screen, so the thresholds are set as depths (in segments): past
+# ~146 bikes and scenery lose their fine detail. One SCALE_Q bucket spans all
+# on-screen bikes, so the impostor needs --lod-bias >~1.05 or a lower --scale.
+LOD_DEPTH = {'bike': (146, 152), 'T': (146,), 'L': (146,), 'B': ()}
+LOD = {k: tuple(2000 * CAM_D / d * (0.8 if k == 'bike' else 1) for d in ds)
+       for k, ds in LOD_DEPTH.items()}
+
+
+def lod_level(sc, th):
+    n = 0
+    while n < len(th) and sc < th[n]:
+        n += 1
+    return n
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ASSETS — bitmap bikes and the road texture from src/assets, loaded once
+# ═══════════════════════════════════════════════════════════════════════════════
+# One-file builds unpack the bundled assets under sys._MEIPASS (see build.sh)
+ASSET_DIR = os.path.join(getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__))),
+                         'assets')
+BIKE_IMG  = {-1: 'bike_lean_left.png', 0: 'bike_center.png', 1: 'bike_lean_right.png'}
+ROAD_IMG  = 'road.jpg'
+BIKE_BMP  = (135, 22)       # bitmap bike height and wheel-to-ground, in units of scale
+BMP_LEAN  = 0.3             # |lean| past which the player shows a leaning bitmap
+TEX_SEGS  = 20              # segments per repeat of the road texture
+TEX_FOG   = 0.85            # strips fogged past this keep their flat colour
+MIP_MIN   = 8               # smallest mip level, px
+ATLAS_W   = 1024
+
+
+def cut_out(img):
+    """Copy of opaque `img` with the flat background around it made
+    transparent: the near-corner-colour regions touching a corner."""
+    w, h = img.get_size()
+    bg = pygame.mask.Mask((w, h))
+    for c in ((0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1)):
+        m = pygame.mask.from_threshold(img, img.get_at(c), (24, 24, 24, 255))
+        bg.draw(m.connected_component(c), (0, 0))
+    bg.invert()
+    out = pygame.Surface((w, h), pygame.SRCALPHA)
+    out.blit(img, (0, 0))
+    out.blit(bg.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0)), (0, 0),
+             special_flags=pygame.BLEND_RGBA_MULT)
+    return out.subsurface(out.get_bounding_rect()).copy()
+
+
+def mip_chain(img):
+    """img, then halves of it (smoothscaled) down to MIP_MIN px."""
+    chain = [img]
+    while min(img.get_size()) >= 2 * MIP_MIN:
+        img = pygame.transform.smoothscale(img, (img.get_width() // 2, img.get_height() // 2))
+        chain.append(img)
+    return chain
+
+
+class Atlas:
+    """Bitmap sprites and the road texture, loaded once per render target.
+
+    The bike images are cut out of their backgrounds, the rear view is
+    also tinted once per RIDER_COLS entry, and every level of their mip
+    chains is shelf-packed into one SRCALPHA surface, `img`. `bikes` maps
+    the player's lean side (-1/0/1) and each rider colour to subsurfaces
+    of it, largest first. The road texture
+    is opaque, so its chain is converted to the target's format instead.
+    Scaling to an exact size starts from the smallest level at least that
+    big, so it is cheap and never minifies by more than half.
+    """
+    def __init__(self, target, path=ASSET_DIR):
+        cut = {k: cut_out(pygame.image.load(os.path.join(path, f))) for k, f in BIKE_IMG.items()}
+        for col in RIDER_COLS:
+            cut[col] = img = cut[0].copy()
+            img.fill(tuple(128 + c // 2 for c in col), special_flags=pygame.BLEND_RGB_MULT)
+        chains = {k: mip_chain(img) for k, img in cut.items()}
+        items = sorted(((k, lv, im) for k, ch in chains.items() for lv, im in enumerate(ch)),
+                       key=lambda t: -t[2].get_height())
+        x = y = shelf = 0
+        rects = []
+        for k, lv, im in items:
+            w, h = im.get_size()
+            if x + w > ATLAS_W:
+                x, y, shelf = 0, y + shelf, 0
+            rects.append((k, lv, pygame.Rect(x, y, w, h)))
+            x += w
+            shelf = max(shelf, h)
+        self.img = pygame.Surface((ATLAS_W, y + shelf), pygame.SRCALPHA)
+        self.bikes = {k: [None] * len(ch) for k, ch in chains.items()}
+        for (k, lv, r), (_, _, im) in zip(rects, items):
+            self.img.blit(im, r)
+            self.bikes[k][lv] = self.img.subsurface(r)
+        road = pygame.image.load(os.path.join(path, ROAD_IMG))
+        tex = pygame.Surface(road.get_size(), 0, target)    # convert(target), display or not
+        tex.blit(road, (0, 0))
+        self.road = mip_chain(tex)
+        self.seg_rows = road.get_height() // TEX_SEGS
+
+    @staticmethod
+    def level(chain, w):
+        """Smallest surface in `chain` at least w px wide (else the largest)."""
+        for im in reversed(chain):
+            if im.get_width() >= w:
+                return im
+        return chain[0]
+
+    def bytes(self):
+        return 4 * (self.img.get_width() * self.img.get_height()
+                    + sum(im.get_width() * im.get_height() for im in self.road))
+
+
+def draw_bitmap(surf, cx, by, s, chain):
+    """A bike bitmap standing on the ground line by + BIKE_BMP[1] * s.
+
+    Only the part inside surf's clip is scaled, so riders right on the
+    camera cost a screenful at most; past the largest level it is a plain
+    pixel scale (the art is pixel art).
+    """
+    h = max(1, int(BIKE_BMP[0] * s))
+    w = max(1, chain[0].get_width() * h // chain[0].get_height())
+    x, y = cx - w // 2, by + int(BIKE_BMP[1] * s) - h
+    vis = pygame.Rect(x, y, w, h).clip(surf.get_clip())
+    if not vis:
+        return
+    src = Atlas.level(chain, w)
+    sw, sh = src.get_size()
+    u0, v0 = (vis.x - x) * sw // w, (vis.y - y) * sh // h
+    u1, v1 = -(-(vis.right - x) * sw // w), -(-(vis.bottom - y) * sh // h)
+    part = src.subsurface((u0, v0, max(1, u1 - u0), max(1, v1 - v0)))
+    img = (pygame.transform.smoothscale if w <= sw else pygame.transform.scale)(part, vis.size)
+    surf.blit(img, vis)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SPRITE CACHE — render each quantized variant once, blit it afterwards
+# ═══════════════════════════════════════════════════════════════════════════════
+SCALE_Q  = 24                   # scale buckets per e-fold (~4% steps)
+LEAN_Q   = 8                    # lean buckets per unit of lean
+WHEEL_Q  = 6                    # wheel-angle buckets per spoke interval
+FOG_Q    = 32                   # fog buckets over 0..1
+SPOKE_A  = 2 * math.pi / 6
+SPRITE_PAD = 8                  # px around the box for max(n, ...) minimum sizes
+SPRITE_MAX_AREA = W * H         # bigger variants cache only their on-screen window
+SPRITE_CLIP = 64                # px grid that window snaps out to, so it survives drift
+SPRITE_CACHE_MB = 48
+
+# Sprite bounds around the anchor, in units of scale: (left, top, right, bottom)
+SPRITE_BOX = {
+    'bike': (100, 115, 100, 35),
+    'T':    (60, 125, 60, 2),
+    'L':    (8, 110, 45, 2),
+    'B':    (68, 206, 68, 2),
+    'bmp':  (66, 113, 66, 22),
+}
+
+
+class SpriteCache:
+    """LRU cache of pre-rendered sprite surfaces keyed by quantized inputs.
+
+    Keys are (kind, scale, lean, wheel, colour, fog, flag) buckets, so nearby
+    poses share a surface. Once the cap is reached the least recently used
+    variants are evicted. hits/misses/evictions are kept for instrumentation.
+
+    Near sprites are bigger than the screen; for those only the window that
+    can land on the target surface is rendered, snapped out to SPRITE_CLIP
+    cells and added to the key, so it stays valid while the anchor drifts.
+    Such a window costs several direct draws to build, so one whose key
+    changes every few frames (spinning spokes, `still` False) isn't cached.
+
+    The level of detail comes from the quantized scale and LOD thresholds
+    times lod_bias (0 keeps full detail everywhere). `lod` counts this frame's
+    sprites per kind and level, with culled ones in the last slot; begin()
+    folds it into `lod_sum` and starts the next frame.
+    """
+    def __init__(self, max_bytes=SPRITE_CACHE_MB << 20, lod_bias=1.0):
+        self.d = OrderedDict()
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.th = {k: tuple(t * lod_bias for t in th) for k, th in LOD.items()}
+        self.lod = {k: [0] * (len(th) + 2) for k, th in LOD.items()}
+        self.lod_sum = {k: [0] * (len(th) + 2) for k, th in LOD.items()}
+        self.frames = 0
+        self.atlas = None       # bitmap bikes instead of draw_bike when set
+
+    def begin(self):
+        for k, n in self.lod.items():
+            tot = self.lod_sum[k]
+            for i, v in enumerate(n):
+                tot[i] += v
+                n[i] = 0
+        self.frames += 1
+
+    def clear(self):
+        self.d.clear()
+        self.bytes = 0
+        for k, th in LOD.items():
+            self.lod[k] = [0] * (len(th) + 2)
+            self.lod_sum[k] = [0] * (len(th) + 2)
+        self.frames = 0
+
+    def stats(self):
+        return {'entries': len(self.d), 'bytes': self.bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'lod': {k: list(v) for k, v in self.lod.items()},
+                'lod_per_frame': {k: [round(v / max(1, self.frames), 2) for v in n]
+                                  for k, n in self.lod_sum.items()}}
+
+    def _get(self, surf, x, y, key, s, box, fn, args, still=True):
+        l, t, r, b = box
+        ox, oy = int(l * s) + SPRITE_PAD, int(t * s) + SPRITE_PAD
+        w, h = ox + int(r * s) + SPRITE_PAD, oy + int(b * s) + SPRITE_PAD
+        x0 = y0 = 0
+        if w * h > SPRITE_MAX_AREA:
+            if not still:
+                return None
+            # surf's rect in sprite coordinates, snapped out to the grid
+            sw, sh = surf.get_size()
+            x0 = max(0, (ox - x) // SPRITE_CLIP * SPRITE_CLIP)
+            y0 = max(0, (oy - y) // SPRITE_CLIP * SPRITE_CLIP)
+            w = min(w, -((x - ox - sw) // SPRITE_CLIP) * SPRITE_CLIP)
+            h = min(h, -((y - oy - sh) // SPRITE_CLIP) * SPRITE_CLIP)
+            if w <= x0 or h <= y0:
+                return None
+            key += ((x0, y0),)
+        ent = self.d.get(key)
+        if ent is not None:
+            self.d.move_to_end(key)
+            self.hits += 1
+            return ent
+        self.misses += 1
+        img = pygame.Surface((w - x0, h - y0), pygame.SRCALPHA)
+        fn(img, ox - x0, oy - y0, *args)
+        # Keep only the drawn pixels, run-length encoded: transparent runs
+        # are skipped and opaque ones copied instead of blended per pixel
+        bb = img.get_bounding_rect()
+        img = img.subsurface(bb).copy()
+        img.set_alpha(255, pygame.RLEACCEL)
+        ent = self.d[key] = (img, ox - x0 - bb.x, oy - y0 - bb.y)
+        self.bytes += bb.w * bb.h * 4
+        while self.bytes > self.max_bytes and len(self.d) > 1:
+            old, _, _ = self.d.popitem(last=False)[1]
+            self.bytes -= old.get_width() * old.get_height() * 4
+            self.evictions += 1
+        return ent
+
+    def _blit(self, surf, ent, x, y):
+        img, ox, oy = ent
+        surf.blit(img, (x - ox, y - oy))
+
+    def bike(self, surf, cx, by, scale, lean, wheel_angle, speed_ratio,
+             body_col=(30, 100, 220), is_player=True):
+        n = self.lod['bike']
+        if scale < 0.06:
+            n[-1] += 1
+            return
+        qi = round(math.log(scale) * SCALE_Q)
+        qs = math.exp(qi / SCALE_Q)
+        if self.atlas is not None:
+            n[0] += 1
+            self._bitmap(surf, cx, by, scale, qi, qs, lean, speed_ratio, body_col, is_player)
+            return
+        # the player rides at ui scale, outside the depth mapping of LOD
+        lod = 0 if is_player else lod_level(qs, self.th['bike'])
+        n[lod] += 1
+        li = round(lean * LEAN_Q) if lod < 2 else 0
+        # no spokes below full detail, so every wheel angle looks the same
+        wi = int((wheel_angle % SPOKE_A) / SPOKE_A * WHEEL_Q) % WHEEL_Q if lod == 0 else 0
+        tail = speed_ratio < 0.3
+        key = ('P' if is_player else 'E', qi, li, wi, body_col, 0, tail)
+        ent = self._get(surf, cx, by, key, qs, SPRITE_BOX['bike'], draw_bike,
+                        (qs, li / LEAN_Q, wi * SPOKE_A / WHEEL_Q, 0.0 if tail else 1.0,
+                         body_col, is_player, False, lod), still=lod > 0)
+        if ent is None:
+            draw_bike(surf, cx, by, scale, lean, wheel_angle, speed_ratio, body_col, is_player,
+                      lod=lod)
+            return
+        self._blit(surf, ent, cx, by)
+        if is_player and speed_ratio > 0.5:
+            draw_flames(surf, cx, by, qs, li / LEAN_Q, speed_ratio)
+
+    def _bitmap(self, surf, cx, by, scale, qi, qs, lean, speed_ratio, body_col, is_player):
+        if is_player:
+            k = 0 if abs(lean) < BMP_LEAN else 1 if lean > 0 else -1
+        else:
+            k = body_col if body_col in self.atlas.bikes else 0
+        chain = self.atlas.bikes[k]
+        ent = self._get(surf, cx, by, ('BMP', qi, 0, 0, k, 0, False), qs, SPRITE_BOX['bmp'],
+                        draw_bitmap, (qs, chain))
+        if ent is None:
+            draw_bitmap(surf, cx, by, scale, chain)
+        else:
+            self._blit(surf, ent, cx, by)
+        if is_player and speed_ratio > 0.5:
+            draw_flames(surf, cx, by, qs, 0.0, speed_ratio)
+
+    def scenery(self, surf, kind, x, y, sc, f, ci=0, win=0):
+        fn = SCENERY_FN[kind]
+        n = self.lod[kind]
+        if sc < SCENERY_MIN[kind]:
+            n[-1] += 1
+            return
+        qi = round(math.log(sc) * SCALE_Q)
+        qs = math.exp(qi / SCALE_Q)
+        fi = round(f * FOG_Q)
+        lod = lod_level(qs, self.th[kind])
+        n[lod] += 1
+        args = (qs, fi / FOG_Q) + ((ci, win) if kind == 'B' else (lod,))
+        ent = self._get(surf, x, y, (kind, qi, 0, 0, (ci, win), fi, False), qs, SPRITE_BOX[kind],
+                        fn, args)
+        if ent is None:
+            fn(surf, x, y, sc, f, *args[2:])
+        else:
+            self._blit(surf, ent, x, y)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ROAD
 # ═══════════════════════════════════════════════════════════════════════════════
 class Seg:
-    __slots__ = ('i','c','h','cars','obj')
-    def __init__(self, i):
+    __slots__ = ('i','c','h','obj','win')
+    def __init__(self, i, c=None, h=None):
         self.i = i
-        t = i / N_SEG
-        self.c = math.sin(t * 22) * 0.55 + math.sin(t * 9.5) * 0.3
-        self.h = math.sin(t * 16) * 1500 + math.sin(t * 6.2) * 700
-        self.cars = []
+        if c is None:
+            t = i / N_SEG
+            c = math.sin(t * 22) * 0.55 + math.sin(t * 9.5) * 0.3
+            h = math.sin(t * 16) * 1500 + math.sin(t * 6.2) * 700
+        self.c, self.h = c, h
         self.obj = []
+        self.win = 0            # building window mask, see window_mask()
 
 
 class Road:
-    def __init__(self):
+    """The classic course: a ring of N_SEG segments, built up front."""
+    n = N_SEG                   # segments before the course wraps
+    length = N_SEG * SEG_L      # world units before the course wraps
+
+    def __init__(self, rng=random, vec=None):
+        self.vec = np is not None if vec is None else vec and np is not None
         self.s = [Seg(i) for i in range(N_SEG)]
         for i in range(0, N_SEG, 3):
             self.s[i].obj += [(-1, 'T'), (1, 'T')]
         for i in range(5, N_SEG, 7):
-            self.s[i].obj.append((random.choice([-1, 1]), 'L'))
+            self.s[i].obj.append((rng.choice([-1, 1]), 'L'))
+        self.seed = rng.randrange(1 << 30)
         for i in range(10, N_SEG, 14):
-            self.s[i].obj.append((random.choice([-1, 1]), 'B'))
+            self.s[i].obj.append((rng.choice([-1, 1]), 'B'))
+            self.s[i].win = window_mask(self.seed * N_SEG + i)
+        pc, ph = [0.0], [0.0]
+        for k in range(N_SEG + DRAW_D + 1):
+            seg = self.s[k % N_SEG]
+            pc.append(pc[-1] + seg.c)
+            ph.append(ph[-1] + seg.h)
+        self.pc, self.ph = pc, ph
+        if np is not None:
+            self.np_pc, self.np_ph = np.array(pc), np.array(ph)
+        self.set_view(W, H)
+
+    def set_view(self, w, h):
+        """Project into a w x h render target.
+
+        Everything scales uniformly by ui = h / H around the horizontal centre,
+        so a lower internal render scale keeps the 800x600 framing and a wider
+        window simply shows more scenery at the sides.
+        """
+        self.vw, self.vh, self.ui = w, h, h / H
+        self.pw = W * self.ui                       # design width in pixels
+        self.hor = int(h * 0.38)
+        self._tables()
+
+    def _tables(self):
+        """Precompute everything the projection loop used to redo per frame.
+
+        pc/ph (built in __init__) are prefix sums of curve/height over N_SEG +
+        DRAW_D segments, so the far-to-near accumulation for any window is a
+        single subtraction. Scale, half-width and fog depend only on depth
+        index i (wz == i*SEG_L); half-width and the vertical scale dscy are in
+        render-target pixels.
+        """
+        self.dsc = [0.0] + [CAM_D / (i * SEG_L) * SEG_L for i in range(1, DRAW_D + 1)]
+        self.dsw = [int(sc * ROAD_W * self.pw / ROAD_W) for sc in self.dsc]
+        self.dscy = [sc * self.ui for sc in self.dsc]
+        self.dfog = [min(1.0, (i / (DRAW_D * 0.85))) ** 1.1 for i in range(DRAW_D + 1)]
+        self.fogc = {c: [fog(c, f) for f in self.dfog]
+                     for c in GRASS_C + ROAD_C + KERB_C + (DASH_C, RAIL_C)}
+        self.dep = list(range(DRAW_D, 0, -1))      # far-to-near depth indices
+        if np is not None:
+            self.np_dep = np.arange(DRAW_D, 0, -1)
+            self.np_sc = np.array(self.dsc)[self.np_dep]
+            self.np_scy = np.array(self.dscy)[self.np_dep]
+
+    def _sums(self, si0, arr=False):
+        """(pc, ph, k0): prefix sums such that the curve/height accumulated
+        from depth i to the far end is pc[k0 + DRAW_D + 1] - pc[k0 + i]."""
+        if arr:
+            return self.np_pc, self.np_ph, si0
+        return self.pc, self.ph, si0
+
+    def project(self, si0, cam_x):
+        """Project the DRAW_D visible segments, far to near.
+
+        Returns parallel lists (depth, seg index, sx, sy, visible); half-width,
+        scale and fog come from the per-depth tables. Uses NumPy when available
+        and self.vec is set, otherwise the pure-Python path.
+        """
+        if self.vec:
+            return self._project_np(si0, cam_x)
+        return self._project_py(si0, cam_x)
+
+    def _project_py(self, si0, cam_x):
+        pc, ph, k0 = self._sums(si0)
+        dsc, dscy, dep, n = self.dsc, self.dscy, self.dep, self.n
+        w, h, pw = self.vw, self.vh, self.pw
+        lo, hi = self.hor - 20 * self.ui, h + 20 * self.ui
+        ccb, chb = pc[k0 + DRAW_D + 1], ph[k0 + DRAW_D + 1]
+        si = [(si0 + i) % n for i in dep]
+        sx = [int(w / 2 + dsc[i] * (cam_x - (ccb - pc[k0 + i]) * 280) * pw / ROAD_W) for i in dep]
+        sy = [int(h / 2 - dscy[i] * (1500 + (chb - ph[k0 + i]))) for i in dep]
+        vis = [lo <= y <= hi for y in sy]
+        return dep, si, sx, sy, vis
+
+    def _project_np(self, si0, cam_x):
+        pc, ph, k0 = self._sums(si0, True)
+        sc = self.np_sc
+        w, h = self.vw, self.vh
+        k = k0 + self.np_dep
+        cc = pc[k0 + DRAW_D + 1] - pc[k]
+        ch = ph[k0 + DRAW_D + 1] - ph[k]
+        sx = (w / 2 + sc * (cam_x - cc * 280) * self.pw / ROAD_W).astype(np.int64)
+        sy = (h / 2 - self.np_scy * (1500 + ch)).astype(np.int64)
+        vis = (sy >= self.hor - 20 * self.ui) & (sy <= h + 20 * self.ui)
+        return self.dep, ((si0 + self.np_dep) % self.n).tolist(), sx.tolist(), sy.tolist(), vis.tolist()
 
     def get(self, i):
         return self.s[i % N_SEG]
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# STREAMED TRACK — seeded segments generated in chunks around the camera
+# ═══════════════════════════════════════════════════════════════════════════════
+CHUNK       = 64            # segments generated at a time
+CHUNKS_KEPT = 8             # at most this many chunks in memory (DRAW_D spans ~4)
+TRACK_N     = 1 << 40       # segments in a streamed course; unbounded in practice
+
+# Scenery mixes a chunk can pick: (tree every n segs, lamp every n, building every n); 0 = none
+TRACK_SCENES = {
+    'forest':  (2, 0, 0),
+    'country': (3, 7, 0),
+    'town':    (0, 4, 3),
+    'open':    (9, 0, 0),
+}
+
+
+class Track(Road):
+    """Endless course generated lazily from `seed`.
+
+    Curve and height are sine sums with per-course frequencies, scaled by an
+    envelope that eases between random per-chunk knots, so any segment can be
+    generated on its own and every chunk looks the same whenever it is
+    (re)built. Chunks carry a scenery mix. Only the chunks around the last
+    projected camera stay in memory: projection evicts the ones behind it,
+    and get(i) anywhere else rebuilds on demand, LRU-capped at CHUNKS_KEPT.
+    """
+    n = TRACK_N
+    length = TRACK_N * SEG_L
+
+    def __init__(self, seed=0, vec=None):
+        self.vec = np is not None if vec is None else vec and np is not None
+        self.seed = seed
+        r = random.Random(seed)
+        self.cw = [(r.uniform(0.04, 0.1), r.uniform(0, 6.3), 0.55),
+                   (r.uniform(0.015, 0.04), r.uniform(0, 6.3), 0.3)]
+        self.hw = [(r.uniform(0.03, 0.07), r.uniform(0, 6.3), 1500),
+                   (r.uniform(0.01, 0.03), r.uniform(0, 6.3), 700)]
+        self.chunks = OrderedDict()
+        self.made = self.evicted = 0
+        self._win = None
+        self.set_view(W, H)
+
+    def stats(self):
+        return {'chunks': len(self.chunks), 'made': self.made, 'evicted': self.evicted}
+
+    def _knots(self, j):
+        r = random.Random(self.seed * 1000003 + j)
+        return r, 0.2 + 1.1 * r.random(), 0.3 + 0.9 * r.random()
+
+    def _chunk(self, j):
+        rng, kc0, kh0 = self._knots(j)
+        _, kc1, kh1 = self._knots(j + 1)
+        tree, lamp, bldg = TRACK_SCENES[rng.choice(sorted(TRACK_SCENES))]
+        segs = []
+        for n in range(CHUNK):
+            i = j * CHUNK + n
+            t = n / CHUNK
+            e = t * t * (3 - 2 * t)
+            c = sum(a * math.sin(f * i + p) for f, p, a in self.cw) * (kc0 + (kc1 - kc0) * e)
+            h = sum(a * math.sin(f * i + p) for f, p, a in self.hw) * (kh0 + (kh1 - kh0) * e)
+            seg = Seg(i, c, h)
+            if tree and i % tree == 0:
+                seg.obj += [(-1, 'T'), (1, 'T')]
+            if lamp and i % lamp == lamp // 2:
+                seg.obj.append((rng.choice([-1, 1]), 'L'))
+            if bldg and i % bldg == 1:
+                seg.obj.append((rng.choice([-1, 1]), 'B'))
+                seg.win = window_mask(self.seed * 1000003 + i)
+            segs.append(seg)
+        self.made += 1
+        return segs
+
+    def get(self, i):
+        j = i // CHUNK
+        ch = self.chunks.get(j)
+        if ch is None:
+            ch = self.chunks[j] = self._chunk(j)
+            while len(self.chunks) > CHUNKS_KEPT:
+                self.chunks.popitem(last=False)
+                self.evicted += 1
+        else:
+            self.chunks.move_to_end(j)
+        return ch[i - j * CHUNK]
+
+    def _sums(self, si0, arr=False):
+        w = self._win
+        if w is None or w[0] != si0:
+            lo, nch = si0 // CHUNK, -(-self.n // CHUNK)
+            for j in [j for j in self.chunks if (j - lo) % nch > DRAW_D // CHUNK + 1]:
+                del self.chunks[j]                  # behind the camera
+                self.evicted += 1
+            pc, ph = [0.0], [0.0]
+            for k in range(DRAW_D + 1):
+                seg = self.get(si0 + k)
+                pc.append(pc[-1] + seg.c)
+                ph.append(ph[-1] + seg.h)
+            w = self._win = [si0, pc, ph, None]
+        if arr:
+            if w[3] is None:
+                w[3] = (np.array(w[1]), np.array(w[2]))
+            return w[3][0], w[3][1], 0
+        return w[1], w[2], 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TRACK FILES — packed little-endian arrays, opened with mmap
+# ═══════════════════════════════════════════════════════════════════════════════
+#   header   magic 'RRTK', version u2, pad u2, segments u4, objects u4, seed u4, pad u4
+#   c, h     f8[segments]       curve and height
+#   win      u4[segments]       building window masks
+#   ostart   u4[segments + 1]   segment i's objects are records ostart[i]:ostart[i+1]
+#   obj      (i1 side, u1 kind)[objects]
+TRACK_MAGIC = b'RRTK'
+TRACK_VER   = 1
+_TRACK_HDR  = struct.Struct('<4sHHIIII')
+OBJ_KINDS   = 'TLB'
+
+
+def save_track(road, path, n=None):
+    """Write segments 0..n-1 of `road` (default: all of a ring Road) to path."""
+    n = road.n if n is None else n
+    if n >= 1 << 32:
+        raise ValueError("pass n: the course is too long to export whole")
+    c, h, win, ostart, obj = array('d'), array('d'), array('I'), array('I', [0]), bytearray()
+    for i in range(n):
+        seg = road.get(i)
+        c.append(seg.c)
+        h.append(seg.h)
+        win.append(seg.win)
+        for side, ot in seg.obj:
+            obj += struct.pack('<bB', side, OBJ_KINDS.index(ot))
+        ostart.append(len(obj) // 2)
+    if sys.byteorder != 'little':
+        for a in (c, h, win, ostart):
+            a.byteswap()
+    with open(path, 'wb') as f:
+        f.write(_TRACK_HDR.pack(TRACK_MAGIC, TRACK_VER, 0, n, len(obj) // 2,
+                                road.seed & 0xffffffff, 0))
+        for a in (c, h, win, ostart):
+            a.tofile(f)
+        f.write(obj)
+
+
+class MappedRoad(Track):
+    """A course read from a save_track() file through mmap.
+
+    The packed arrays are used in place (memoryview casts, no parsing);
+    Segs exist only for the chunks around the camera, as with Track, and
+    the course wraps after its last segment like the ring Road.
+    """
+    def __init__(self, path, vec=None):
+        self.vec = np is not None if vec is None else vec and np is not None
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mv = memoryview(self.mm)
+        magic, ver, _, n, m, self.seed, _ = _TRACK_HDR.unpack_from(mv)
+        if magic != TRACK_MAGIC or ver != TRACK_VER:
+            raise ValueError(f"{path}: not a version {TRACK_VER} track file")
+        if len(mv) != _TRACK_HDR.size + 24 * n + 4 + 2 * m:
+            raise ValueError(f"{path}: truncated track file")
+        self.n, self.length = n, n * SEG_L
+        o = _TRACK_HDR.size
+        arrs = []
+        for code, k in (('d', n), ('d', n), ('I', n), ('I', n + 1)):
+            sz = array(code).itemsize * k
+            arrs.append(mv[o:o + sz].cast(code))
+            o += sz
+        if sys.byteorder != 'little':        # mapped data is little-endian: swap a copy
+            arrs = [array(a.format, a) for a in arrs]
+            for a in arrs:
+                a.byteswap()
+        self.c, self.h, self.win, self.ostart = arrs
+        self.obj = mv[o:].cast('b')
+        self.chunks = OrderedDict()
+        self.made = self.evicted = 0
+        self._win = None
+        self.set_view(W, H)
+
+    def _chunk(self, j):
+        c, h, win, ost, obj = self.c, self.h, self.win, self.ostart, self.obj
+        segs = []
+        for i in range(j * CHUNK, min(self.n, (j + 1) * CHUNK)):
+            seg = Seg(i, c[i], h[i])
+            seg.win = win[i]
+            seg.obj = [(obj[2 * k], OBJ_KINDS[obj[2 * k + 1]]) for k in range(ost[i], ost[i + 1])]
+            segs.append(seg)
+        self.made += 1
+        return segs
+
+    def get(self, i):
+        return Track.get(self, i % self.n)
+
+    def close(self):
+        self.c = self.h = self.win = self.ostart = self.obj = None
+        self.mm.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENEMY RIDERS — structure-of-arrays store
+# ═══════════════════════════════════════════════════════════════════════════════
+RIDER_COLS = [(200,40,40),(40,180,40),(220,160,30),(180,40,180),(40,180,180)]
+LANE_V = 0.6        # lane units per second a rider drifts toward its target
+_SEG_IDS = np.arange(N_SEG + 1) if np is not None else None
+
+
+class Riders:
+    """Enemy riders as parallel arrays instead of per-rider objects.
+
+    z (track position), lane, spd, tgt (target lane), tmr (seconds until the
+    next lane change) and col (RIDER_COLS index) are NumPy arrays when
+    available, else `array`. step() moves every rider in one batch and
+    rebucket() sorts them by (segment, lane): segment si's riders are then the
+    run start[si]:start[si+1] of order/slane/scol, and near() bisects it.
+    """
+    def __init__(self, vec=None):
+        self.vec = np is not None if vec is None else vec and np is not None
+        self.spawn(random, 0, 0.0)
+
+    def _arr(self, code, vals):
+        if self.vec:
+            return np.array(vals, dtype=np.float64 if code == 'd' else np.int64)
+        return array(code, vals)
+
+    def spawn(self, rng, n, mspd, first=8):
+        """Place n riders at random on segments first..N_SEG-1."""
+        z, ln, sp, tm, cl = [], [], [], [], []
+        for _ in range(n):
+            z.append((rng.randint(first, N_SEG - 1) + rng.random()) * SEG_L)
+            ln.append(rng.uniform(-0.65, 0.65))
+            sp.append(rng.uniform(0.3, 0.7) * mspd)
+            tm.append(rng.uniform(1.5, 4.0))
+            cl.append(rng.randrange(len(RIDER_COLS)))
+        self.n = n
+        self.z, self.lane, self.spd = self._arr('d', z), self._arr('d', ln), self._arr('d', sp)
+        self.tgt, self.tmr, self.col = self._arr('d', ln), self._arr('d', tm), self._arr('q', cl)
+        self.rebucket()
+
+    def step(self, dt, rng):
+        """Advance all riders by dt, then re-bucket them into segments."""
+        L, v = N_SEG * SEG_L, LANE_V * dt
+        z, lane, spd, tgt, tmr = self.z, self.lane, self.spd, self.tgt, self.tmr
+        if self.vec:
+            z += spd * dt
+            np.mod(z, L, out=z)
+            lane += np.minimum(np.maximum(tgt - lane, -v), v)
+            tmr -= dt
+            due = (tmr <= 0).nonzero()[0].tolist()
+        else:
+            due = []
+            for k in range(self.n):
+                z[k] = (z[k] + spd[k] * dt) % L
+                lane[k] += max(-v, min(v, tgt[k] - lane[k]))
+                tmr[k] -= dt
+                if tmr[k] <= 0:
+                    due.append(k)
+        # Lane-change AI: riders whose timer ran out pick a new lane
+        for k in due:
+            tgt[k] = rng.uniform(-0.65, 0.65)
+            tmr[k] = rng.uniform(1.5, 4.0)
+        self.rebucket()
+
+    def rebucket(self):
+        n = self.n
+        if self.vec:
+            seg = (self.z / SEG_L).astype(np.int64) % N_SEG
+            order = np.lexsort((self.lane, seg))
+            self.start = seg[order].searchsorted(_SEG_IDS).tolist()
+            self.slane = self.lane[order].tolist()
+            self.scol = self.col[order].tolist()
+            self.order = order.tolist()
+            return
+        z, lane = self.z, self.lane
+        seg = [int(z[k] / SEG_L) % N_SEG for k in range(n)]
+        order = sorted(range(n), key=lambda k: (seg[k], lane[k]))
+        start = [0] * (N_SEG + 1)
+        for si in seg:
+            start[si + 1] += 1
+        for si in range(N_SEG):
+            start[si + 1] += start[si]
+        self.start = start
+        self.slane = [lane[k] for k in order]
+        self.scol = [self.col[k] for k in order]
+        self.order = order
+
+    def near(self, si, x, r, span=1):
+        """Ids of riders strictly within lane distance r of x on segments si±span."""
+        out = []
+        st, ln = self.start, self.slane
+        for d in range(-span, span + 1):
+            s = (si + d) % N_SEG
+            b = st[s + 1]
+            lo = bisect_right(ln, x - r, st[s], b)
+            hi = bisect_left(ln, x + r, lo, b)
+            if hi > lo:
+                out += self.order[lo:hi]
+        return out
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PARTICLES
 # ═══════════════════════════════════════════════════════════════════════════════
-class Spark:
-    def __init__(self, x, y, speed_ratio):
-        self.x = x + random.uniform(-15, 15)
-        self.y = y
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-4, -1) * speed_ratio
-        self.life = random.randint(5, 14)
-        self.col = random.choice([(255,180,40),(255,130,20),(220,220,220)])
-        self.r = random.randint(1, 3)
+#  kind:     (colours, life ticks, radius px, vx range, vy range, gravity/tick)
+PARTICLE_KINDS = {
+    'spark':  ([(255,180,40),(255,130,20),(220,220,220)], (5, 14), (1, 3), (-2, 2), (-4, -1), 0.18),
+    'smoke':  ([(120,120,125),(150,150,155)], (18, 36), (3, 6), (-0.6, 0.6), (-1.4, -0.5), -0.01),
+    'dust':   ([(150,120,80),(175,145,100)], (10, 24), (2, 4), (-2.5, 2.5), (-2.0, -0.5), 0.08),
+    'debris': ([(210,210,220),(90,90,90),(255,140,30)], (24, 48), (1, 3), (-7, 7), (-9, -2), 0.35),
+}
+PARTICLE_CAP = 4096
+ALPHA_Q = 16            # pre-baked alpha levels per dot
+
+
+class Particles:
+    """Fixed-capacity particle pool stored as parallel arrays.
+
+    Live particles are packed into slots 0..n-1; step() moves them all in one
+    batch and compacts out the expired ones, so memory stays constant and no
+    per-particle objects are created. Dots are pre-baked per (colour, radius,
+    alpha level) and drawn with a single Surface.blits() call.
+    """
+    def __init__(self, cap=PARTICLE_CAP, vec=None):
+        self.vec = np is not None if vec is None else vec and np is not None
+        self.cap = cap
+        mk = (lambda: np.zeros(cap)) if self.vec else (lambda: array('d', bytes(8 * cap)))
+        self.x, self.y, self.vx, self.vy = mk(), mk(), mk(), mk()
+        self.g, self.life, self.l0, self.ci, self.r = mk(), mk(), mk(), mk(), mk()
+        self.n = self.peak = self.dropped = 0
+        self.dots = {}
+        self._base, self._cols = {}, []     # first colour index of each kind; all colours
+        for k, spec in PARTICLE_KINDS.items():
+            self._base[k] = len(self._cols)
+            self._cols += spec[0]
+
+    def clear(self):
+        self.n = 0
+
+    def stats(self):
+        return {'capacity': self.cap, 'live': self.n, 'peak': self.peak, 'dropped': self.dropped}
+
+    def emit(self, kind, x, y, count, rng, vy_k=1.0, jitter=15):
+        cols, (l0, l1), (r0, r1), (vx0, vx1), (vy0, vy1), g = PARTICLE_KINDS[kind]
+        base = self._base[kind]
+        for _ in range(count):
+            k = self.n
+            if k >= self.cap:
+                self.dropped += 1
+                continue
+            self.x[k] = x + rng.uniform(-jitter, jitter)
+            self.y[k] = y
+            self.vx[k] = rng.uniform(vx0, vx1)
+            self.vy[k] = rng.uniform(vy0, vy1) * vy_k
+            self.life[k] = rng.randint(l0, l1)
+            self.l0[k] = l1
+            self.ci[k] = base + rng.randrange(len(cols))
+            self.r[k] = rng.randint(r0, r1)
+            self.g[k] = g
+            self.n = k + 1
+        self.peak = max(self.peak, self.n)
 
     def step(self):
-        self.x += self.vx; self.y += self.vy; self.vy += 0.18; self.life -= 1
-
-    def draw(self, surf):
-        a = max(0, int(220 * self.life / 14))
-        ps = pygame.Surface((self.r*2+2, self.r*2+2), pygame.SRCALPHA)
-        pygame.draw.circle(ps, (*self.col, a), (self.r+1, self.r+1), self.r)
-        surf.blit(ps, (int(self.x)-self.r-1, int(self.y)-self.r-1))
+        """Drop expired particles, then advance the rest by one tick."""
+        n = self.n
+        arrs = (self.x, self.y, self.vx, self.vy, self.g, self.life, self.l0, self.ci, self.r)
+        if self.vec:
+            alive = self.life[:n] > 0
+            m = int(alive.sum())
+            if m < n:
+                for v in arrs:
+                    v[:m] = v[:n][alive]
+            self.x[:m] += self.vx[:m]
+            self.y[:m] += self.vy[:m]
+            self.vy[:m] += self.g[:m]
+            self.life[:m] -= 1
+        else:
+            x, y, vx, vy, g, life = arrs[:6]
+            m = 0
+            for k in range(n):
+                if life[k] <= 0:
+                    continue
+                if m != k:
+                    for v in arrs:
+                        v[m] = v[k]
+                x[m] += vx[m]; y[m] += vy[m]; vy[m] += g[m]; life[m] -= 1
+                m += 1
+        self.n = m
+
+    def _bake(self, c, r):
+        col, lv = self._cols[c], []
+        for q in range(ALPHA_Q):
+            d = pygame.Surface((r*2+2, r*2+2), pygame.SRCALPHA)
+            pygame.draw.circle(d, (*col, int(220 * q / (ALPHA_Q - 1))), (r+1, r+1), r)
+            lv.append(d)
+        self.dots[(c, r)] = lv
+
+    def draw(self, surf, k=1.0, ox=0.0):
+        """Blit live particles. Positions are in W x H design space; other
+        render targets pass their scale k and horizontal offset ox."""
+        self.blit(surf, self.snap(k, ox))
+
+    def snap(self, k=1.0, ox=0.0):
+        """Live particles as plain lists (x, y, alpha level, colour, radius)
+        in render-target pixels, or None; blit() draws them."""
+        n = self.n
+        if not n:
+            return None
+        if self.vec:
+            xs = (self.x[:n] * k + ox).astype(np.int64).tolist()
+            ys = (self.y[:n] * k).astype(np.int64).tolist()
+            qs = np.clip(self.life[:n] * (ALPHA_Q - 1) / self.l0[:n], 0, ALPHA_Q - 1).astype(np.int64).tolist()
+            cs = self.ci[:n].astype(np.int64).tolist()
+            rs = np.maximum(1, self.r[:n] * k).astype(np.int64).tolist()
+        else:
+            xs = [int(v * k + ox) for v in self.x[:n]]
+            ys = [int(v * k) for v in self.y[:n]]
+            qs = [max(0, min(ALPHA_Q - 1, int(l * (ALPHA_Q - 1) / l0)))
+                  for l, l0 in zip(self.life[:n], self.l0[:n])]
+            cs = [int(v) for v in self.ci[:n]]
+            rs = [max(1, int(v * k)) for v in self.r[:n]]
+        return xs, ys, qs, cs, rs
+
+    def blit(self, surf, snap):
+        if snap is None:
+            return
+        xs, ys, qs, cs, rs = snap
+        dots = self.dots
+        for c, r in set(zip(cs, rs)) - dots.keys():
+            self._bake(c, r)
+        surf.blits([(dots[(c, r)][q], (x - r - 1, y - r - 1))
+                    for x, y, q, c, r in zip(xs, ys, qs, cs, rs)], doreturn=False)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# GAME
+# SIMULATION — physics, scoring and collision; no display required
 # ═══════════════════════════════════════════════════════════════════════════════
-class Game:
-    def __init__(self):
-        pygame.init()
-        self.scr = pygame.display.set_mode((W, H))
-        pygame.display.set_caption("Road Rash 3D")
-        self.clk = pygame.time.Clock()
-        self.fxl = pygame.font.SysFont(None, 52, bold=True)
-        self.flg = pygame.font.SysFont(None, 36, bold=True)
-        self.fmd = pygame.font.SysFont(None, 26, bold=True)
-        self.fsm = pygame.font.SysFont(None, 20)
-        self.road = Road()
-        self.sparks = []
-        self.clouds = [(random.randint(0, W), random.randint(8, HOR - 30),
-                        random.randint(60, 160)) for _ in range(10)]
+NO_INPUT = (False, False, 0)      # (throttle, brake, steer -1/0/1)
+SIM_HZ    = 120       # fixed physics rate of the interactive game
+MAX_TICKS = 12        # sim steps per rendered frame before time is dropped
+LERP = ('pos', 'px', 'lean', 'bob', 'wheel_angle')   # interpolated for rendering
+
+
+def key_input(k):
+    """Map a pygame.key.get_pressed() snapshot to a (throttle, brake, steer) tuple."""
+    st = 0
+    if k[pygame.K_LEFT] or k[pygame.K_a]: st = -1
+    if k[pygame.K_RIGHT] or k[pygame.K_d]: st = 1
+    return (bool(k[pygame.K_UP] or k[pygame.K_w]),
+            bool(k[pygame.K_DOWN] or k[pygame.K_s]), st)
+
+
+class Sim:
+    """Seedable race state stepped with an explicit dt and input tuple.
+
+    Game layers the window, keyboard and drawing on top of this; headless
+    callers (benchmarks, regression runs) drive step() directly. Per-tick
+    factors are scaled to dt and particles keep the 60 Hz ticks they were
+    tuned for (settle()), so the race feels alike at any step rate, but a
+    run is only reproducible at the same one: the seed, inputs and dt fix
+    the result. Replays record their hz for that reason.
+    """
+    collide = True      # False rides through riders (render benchmarks)
+
+    def __init__(self, seed=None, road=None, riders=RIDERS):
+        self.rng = random.Random(seed)
+        self.road = road or Road(self.rng)
+        self.n_riders = riders
+        self.riders = Riders()
+        self.fx = Particles()
         self.wheel_angle = 0.0
         self.reset()
 
-    def reset(self):
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        rng = self.rng
         self.pos = 0.0
         self.spd = 0.0
         self.mspd = SEG_L / FPS * 9
@@ -312,272 +1232,1448 @@ class Game:
         self.score = 0
         self.go = False
         self.dead = False
-        self.t0 = 0.0
+        self.t = 0.0
+        self.ticks = 0
         self.bob = 0.0
-        self.sparks = []
-        for seg in self.road.s:
-            seg.cars = []
-        # Spawn 30 enemy bikers spread across the track
-        for _ in range(30):
-            si = random.randint(8, N_SEG - 1)
-            self.road.s[si].cars.append({
-                'lane': random.uniform(-0.65, 0.65),
-                'col': random.choice([(200,40,40),(40,180,40),(220,160,30),(180,40,180),(40,180,180)]),
-            })
+        self.fx_t = 0.0
+        self.fx.clear()
+        self.riders.spawn(rng, self.n_riders, self.mspd)
 
-    def run(self):
-        while True:
-            dt = self.clk.tick(FPS) / 1000.0
-            if not self.go:
-                self.pos = (self.pos + self.mspd * 0.35 * dt) % (N_SEG * SEG_L)
-                self.wheel_angle += 3.0 * dt  # slow spin on title
-            for ev in pygame.event.get():
-                if ev.type == pygame.QUIT: pygame.quit(); return
-                if ev.type == pygame.KEYDOWN:
-                    if ev.key == pygame.K_ESCAPE: pygame.quit(); return
-                    if ev.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        if not self.go or self.dead:
-                            self.reset()
-                            self.go = True
-                            self.t0 = time.time()
-            if self.go and not self.dead:
-                self._upd(dt)
-            self._drw()
-            pygame.display.flip()
-
-    def _upd(self, dt):
-        k = pygame.key.get_pressed()
+    def step(self, dt, inp):
+        thr, brk, st = inp
         a = self.mspd * dt
-        if k[pygame.K_UP] or k[pygame.K_w]:
+        if thr:
             self.spd = min(self.spd + a * 1.5, self.mspd)
-        elif k[pygame.K_DOWN] or k[pygame.K_s]:
+        elif brk:
             self.spd = max(self.spd - a * 3.0, 0)
         else:
             self.spd = max(self.spd - a * 0.5, 0)
 
-        st = 0
-        if k[pygame.K_LEFT] or k[pygame.K_a]: st = -1
-        if k[pygame.K_RIGHT] or k[pygame.K_d]: st = 1
-
         sr = self.spd / max(self.mspd, 0.01)
-        self.lean = self.lean * 0.72 + st * sr * 0.28
+        k = dt * FPS                    # the per-tick factors below are per 60 Hz tick
+        keep = 0.72 ** k
+        self.lean = self.lean * keep + st * sr * (1 - keep)
         self.px = max(-0.95, min(0.95, self.px + st * dt * 2.2 * (sr + 0.15)))
         if abs(self.px) > 0.85:
-            self.spd *= 0.92
+            self.spd *= 0.92 ** k
 
-        self.pos = (self.pos + self.spd * dt) % (N_SEG * SEG_L)
-        self.score = int((time.time() - self.t0) * 12 * sr)
+        self.t += dt
+        self.ticks += 1
+        self.pos = (self.pos + self.spd * dt) % self.road.length
+        self.score = int(self.t * 12 * sr)
         self.bob += self.spd * dt * 9
         self.wheel_angle += self.spd * dt * 18  # fast spin!
 
-        # Sparks
-        if sr > 0.4 and random.random() < sr * 0.5:
-            bx = W // 2 + int(self.lean * 50)
-            self.sparks.append(Spark(bx, H - 40, sr))
-        self.sparks = [s for s in self.sparks if s.life > 0]
-        for s in self.sparks:
-            s.step()
-
-        # Collision
+        # Particles: sparks at speed, exhaust smoke, dust off the tarmac
+        rng, fx = self.rng, self.fx
+        self.fx_t += k
+        while self.fx_t >= 1:
+            self.fx_t -= 1
+            if sr > 0.4 and rng.random() < sr * 0.5:
+                fx.emit('spark', W // 2 + int(self.lean * 50), H - 40, 1, rng, sr)
+            if thr and rng.random() < 0.3:
+                fx.emit('smoke', W // 2 + int(self.lean * 82) + 34, H - 50, 1, rng, jitter=3)
+            if abs(self.px) > 0.85 and sr > 0.1:
+                fx.emit('dust', W // 2 + int(self.lean * 60), H - 35, 2, rng, sr, jitter=25)
+            fx.step()
+
+        self.riders.step(dt, rng)
+
+        # Collision (riders circle an N_SEG ring that repeats along longer tracks)
         si = int(self.pos / SEG_L) % N_SEG
-        for d in range(-1, 4):
-            for car in self.road.get(si + d).cars:
-                if abs(car['lane'] - self.px) < 0.2 and abs(d) <= 1:
-                    self.dead = True
-                    self.go = False
+        if self.collide and self.riders.near(si, self.px, 0.2):
+            self.dead = True
+            self.go = False
+            self.spd = 0.0          # the wreck stops: no speed lines or flames behind the overlay
+            fx.emit('debris', W // 2 + int(self.lean * 60), H - 80, 80, rng, jitter=30)
+
+
+    def settle(self, dt):
+        """Advance particles only (crash debris) by dt."""
+        self.fx_t += dt * FPS
+        while self.fx_t >= 1:
+            self.fx_t -= 1
+            self.fx.step()
+
+
+def simulate(policy, ticks, dt=1.0 / FPS, seed=None, road=None, riders=RIDERS):
+    """Run one headless race for up to `ticks` fixed steps and return the Sim.
+
+    `policy` is either a callable(sim) -> input tuple or a sequence of input
+    tuples (NO_INPUT is used once the script runs out).
+    """
+    sim = Sim(seed, road, riders)
+    sim.go = True
+    script = None if callable(policy) else policy
+    for n in range(ticks):
+        if sim.dead:
+            break
+        if script is None:
+            inp = policy(sim)
+        else:
+            inp = script[n] if n < len(script) else NO_INPUT
+        sim.step(dt, inp)
+    return sim
 
-    def _drw(self):
-        scr = self.scr
-        scr.fill((5, 5, 15))
 
-        # ── Sky gradient ──
-        for y in range(HOR + 10):
-            t = y / (HOR + 10)
-            scr.fill((int(8 + t * 75), int(25 + t * 115), int(80 + t * 140)), (0, y, W, 1))
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPLAYS — per-tick input logs, re-run headless or re-rendered offscreen
+# ═══════════════════════════════════════════════════════════════════════════════
+# Layout (little-endian):
+#   header   '<4sHI'   magic b'RRRP', version, meta length
+#   meta     utf-8 JSON {course, hz, riders}
+#   races    '<IIIBddI' seed, ticks, score, dead, pos, px, input bytes
+#            then zlib(one byte per tick: throttle | brake << 1 | (steer + 1) << 2)
+# A race is appended when it ends, so a crashed session keeps what it finished.
+REPLAY_MAGIC = b'RRRP'
+REPLAY_VER   = 1
+_REPLAY_HDR  = struct.Struct('<4sHI')
+_RACE_HDR    = struct.Struct('<IIIBddI')
+INPUTS = [(bool(b & 1), bool(b & 2), (b >> 2) - 1) for b in range(12)]   # byte -> input
+
+
+def course_spec(road):
+    """JSON description a replay rebuilds `road` from (see course_road()), or
+    None for a ring Road built from an unrecorded rng. Track files are kept
+    by absolute path, so the replay loads from any working directory."""
+    if isinstance(road, MappedRoad):
+        return ['track', os.path.abspath(road.path)]
+    if isinstance(road, Track):
+        return ['endless', road.seed]
+    course = getattr(road, 'course', None)
+    return None if course is None else ['ring', course]
+
+
+def course_road(spec):
+    kind, arg = spec
+    if kind == 'track':
+        return MappedRoad(arg)
+    if kind == 'endless':
+        return Track(arg)
+    road = Road(random.Random(arg))
+    road.course = arg
+    return road
+
+
+class Recorder:
+    """Appends each race's seed and per-tick inputs to a replay file."""
+    def __init__(self, path, road, hz, riders):
+        spec = course_spec(road)
+        if spec is None:
+            raise ValueError("can only record seeded courses (see course_road)")
+        meta = json.dumps({'course': spec, 'hz': hz, 'riders': riders}).encode()
+        self.f = open(path, 'wb')
+        self.f.write(_REPLAY_HDR.pack(REPLAY_MAGIC, REPLAY_VER, len(meta)) + meta)
+        self.seed = None
+        self.buf = bytearray()
+        self.races = 0
+
+    def start(self, seed):
+        self.seed = seed
+        self.buf.clear()
+
+    def tick(self, inp):
+        thr, brk, st = inp
+        self.buf.append(thr | brk << 1 | (st + 1) << 2)
+
+    def end(self, sim):
+        """Write the race in progress, with its end state for verification."""
+        if self.seed is None or not self.buf:
+            return
+        z = zlib.compress(bytes(self.buf), 9)
+        self.f.write(_RACE_HDR.pack(self.seed, sim.ticks, sim.score, sim.dead,
+                                    sim.pos, sim.px, len(z)) + z)
+        self.f.flush()
+        self.seed = None
+        self.races += 1
+
+    def close(self, sim):
+        self.end(sim)
+        self.f.close()
+
+
+def load_replay(path):
+    """Return (meta, races); each race is a dict with its seed, input bytes
+    and the recorded end state."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, ver, ml = _REPLAY_HDR.unpack_from(data)
+    if magic != REPLAY_MAGIC or ver != REPLAY_VER:
+        raise ValueError(f"{path}: not a version {REPLAY_VER} replay")
+    o = _REPLAY_HDR.size
+    meta = json.loads(data[o:o + ml])
+    o += ml
+    races = []
+    while o < len(data):
+        seed, ticks, score, dead, pos, px, zl = _RACE_HDR.unpack_from(data, o)
+        o += _RACE_HDR.size
+        inputs = zlib.decompress(data[o:o + zl])
+        o += zl
+        if len(inputs) != ticks:
+            raise ValueError(f"{path}: race {len(races)} logs {len(inputs)} of {ticks} ticks")
+        races.append({'seed': seed, 'inputs': inputs,
+                      'end': (ticks, score, bool(dead), pos, px)})
+    return meta, races
+
+
+def replay(sim, race, dt, each=None):
+    """Re-run `race` on `sim` and return its end state, which matches
+    race['end'] when the simulation is unchanged. `each(sim)` runs after
+    every tick (offscreen rendering)."""
+    sim.reset(race['seed'])
+    sim.go = True
+    step = sim.step
+    for b in race['inputs']:
+        step(dt, INPUTS[b])
+        if each is not None:
+            each(sim)
+    return (sim.ticks, sim.score, sim.dead, sim.pos, sim.px)
 
-        # Clouds
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BACKGROUND — sky, clouds and hills pre-rendered once, scrolled for parallax
+# ═══════════════════════════════════════════════════════════════════════════════
+THEME = {
+    'sky0':  (8, 25, 80),           # gradient top
+    'sky1':  (83, 140, 220),        # gradient bottom (HOR + 10)
+    'cloud': (255, 255, 255, 90),
+    'hill':  (18, 85, 18),
+}
+HILL_P = 2 * math.pi * 65           # hill wavelength in px (sin(x / 65))
+HILL_KEY = (255, 0, 255)
+
+
+class Background:
+    """Static sky/cloud layer plus a wrap-around hill strip.
+
+    Both are built on first use and rebuilt only when the target size or the
+    theme changes; a frame then costs two blits. The hills scroll by
+    pos * 0.00015 radians, i.e. a horizontal offset into the strip.
+    """
+    def __init__(self, clouds, theme=THEME):
+        self.clouds = clouds
+        self.theme = dict(theme)
+        self.size = None
+
+    def set_theme(self, theme):
+        self.theme = dict(theme)
+        self.invalidate()
+
+    def invalidate(self):
+        self.size = None
+
+    def _build(self, scr):
+        w, h = self.size = scr.get_size()
+        u, kx = h / H, w / W                # clouds are placed in W x H design space
+        hor = int(h * 0.38)
+        sh = hor + int(10 * u)
+        th = self.theme
+        (r0, g0, b0), (r1, g1, b1) = th['sky0'], th['sky1']
+        # target's pixel layout minus any alpha channel (render-worker frames have one)
+        fmt = scr.get_bitsize(), scr.get_masks()[:3] + (0,)
+        sky = self.sky = pygame.Surface((w, sh), 0, *fmt)
+        for y in range(sh):
+            t = y / sh
+            sky.fill((int(r0 + t * (r1 - r0)), int(g0 + t * (g1 - g0)), int(b0 + t * (b1 - b0))),
+                     (0, y, w, 1))
         for cx, cy, cr in self.clouds:
+            cx, cy, cr = int(cx * kx), int(cy * u), max(2, int(cr * u))
             cs = pygame.Surface((cr * 2, int(cr * 0.55)), pygame.SRCALPHA)
-            pygame.draw.ellipse(cs, (255, 255, 255, 90), cs.get_rect())
-            scr.blit(cs, (cx - cr, cy))
+            pygame.draw.ellipse(cs, th['cloud'], cs.get_rect())
+            sky.blit(cs, (cx - cr, cy))
+        # Hill strip: one extra wavelength wide so any phase is a sub-rect
+        self.u, self.period = u, HILL_P * u
+        self.hill_h = hh = int(45 * u)
+        sw = w + int(self.period) + int(32 * u)
+        hill = self.hill = pygame.Surface((sw, hh), 0, *fmt)
+        hill.fill(HILL_KEY)
+        step = max(4, int(16 * u))
+        pts = ([(0, hh - 1)] +
+               [(x, int(19 * u) - int(18 * u * math.sin(x / (65 * u)))) for x in range(0, sw + step, step)] +
+               [(sw, hh - 1)])
+        pygame.draw.polygon(hill, th['hill'], pts)
+        hill.set_colorkey(HILL_KEY)
+        self.hill_y = hor - int(19 * u)
+
+    def draw(self, scr, pos):
+        if self.size != scr.get_size():
+            self._build(scr)
+        scr.blit(self.sky, (0, 0))
+        off = int((pos * 0.00015 * 65 * self.u) % self.period)
+        scr.blit(self.hill, (0, self.hill_y), (off, 0, self.size[0], self.hill_h))
 
-        # Hills
-        pts = [(0, HOR + 25)]
-        for x in range(0, W + 20, 16):
-            pts.append((x, HOR - int(18 * math.sin(x / 65 + self.pos * 0.00015))))
-        pts.append((W, HOR + 25))
-        pygame.draw.polygon(scr, (18, 85, 18), pts)
 
-        # Fill below horizon with grass
-        pygame.draw.rect(scr, (20, 90, 20), (0, HOR, W, H - HOR))
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEXT / PANEL CACHE — HUD and overlays without per-frame rasterization
+# ═══════════════════════════════════════════════════════════════════════════════
+TEXT_CACHE_N = 256
+PANEL_N = 32                # speed-line panels vary with speed; HUD/overlays are a few
+
+
+class TextCache:
+    """LRU-bounded memo of font.render() keyed by (font, text, colour).
+
+    Steady-state frames only blit: a HUD string is rasterized again only when
+    its value changes. panel() hands out persistent translucent fills (HUD
+    bar, full-screen overlays, speed lines) instead of new surfaces, kept in
+    an LRU of panel_cap.
+    """
+    def __init__(self, cap=TEXT_CACHE_N, panel_cap=PANEL_N):
+        self.d = OrderedDict()
+        self.cap = cap
+        self.panels = OrderedDict()
+        self.panel_cap = panel_cap
+        self.hits = self.misses = 0
+
+    def stats(self):
+        return {'entries': len(self.d), 'panels': len(self.panels),
+                'hits': self.hits, 'misses': self.misses}
+
+    def text(self, font, txt, col):
+        key = (font, txt, col)
+        ts = self.d.get(key)
+        if ts is not None:
+            self.d.move_to_end(key)
+            self.hits += 1
+            return ts
+        self.misses += 1
+        ts = self.d[key] = font.render(txt, True, col)
+        if len(self.d) > self.cap:
+            self.d.popitem(last=False)
+        return ts
+
+    def panel(self, w, h, rgba):
+        key = (w, h, rgba)
+        ps = self.panels.get(key)
+        if ps is not None:
+            self.panels.move_to_end(key)
+            return ps
+        ps = self.panels[key] = pygame.Surface((w, h), pygame.SRCALPHA)
+        ps.fill(rgba)
+        if len(self.panels) > self.panel_cap:
+            self.panels.popitem(last=False)
+        return ps
 
-        # ── Road projection ──
-        cz = self.pos
-        si0 = int(cz / SEG_L) % N_SEG
-        cam_x = self.px * ROAD_W
-        sr = self.spd / max(self.mspd, 0.01)
 
-        plx = prx = psy = None
-        sprites = []
-        cc = ch = 0.0
-
-        for i in range(DRAW_D, 0, -1):
-            si = (si0 + i) % N_SEG
-            seg = self.road.get(si)
-            cc += seg.c
-            ch += seg.h
-            f = min(1.0, (i / (DRAW_D * 0.85))) ** 1.1
-
-            wz = (si - si0) * SEG_L
-            if wz <= 0: wz += N_SEG * SEG_L
-            if wz < 1: continue
-
-            sc = CAM_D / wz * SEG_L
-            sx = int(W / 2 + sc * (cam_x - cc * 280) * W / ROAD_W)
-            sy = int(H / 2 - sc * (1500 + ch))
-            sw = int(sc * ROAD_W * W / ROAD_W)
-
-            if sy < HOR - 20 or sy > H + 20:
-                continue
+# ═══════════════════════════════════════════════════════════════════════════════
+# DISPLAY — full flip, or dirty-band updates with an idle refresh rate
+# ═══════════════════════════════════════════════════════════════════════════════
+DISPLAY_MODES = ('flip', 'dirty')
+DIRTY_BAND = 32             # rows per compared band
+IDLE_AFTER = 30             # unchanged frames before dropping to IDLE_FPS
+IDLE_FPS   = 5
+
+
+class Display:
+    """Presents finished frames to the window.
+
+    'flip' pushes the whole frame every tick. 'dirty' compares the frame with
+    the previous one in DIRTY_BAND-row bands and hands only the changed bands
+    to pygame.display.update(); once nothing has changed for IDLE_AFTER
+    frames, `idle` tells the loop to tick at IDLE_FPS until input arrives.
+    With NumPy the frame is compared in place and only the changed bands are
+    copied into the kept one; without it the whole frame is copied as bytes.
+    The title screen's road keeps scrolling, so only still screens (the
+    crash screen) go idle.
+    """
+    def __init__(self, mode='flip'):
+        if mode not in DISPLAY_MODES:
+            raise ValueError(f"display mode must be one of {DISPLAY_MODES}, not {mode!r}")
+        self.mode = mode
+        self.prev = None
+        self.still = 0
+        self.frames = self.bands = self.pushed = 0
+
+    @property
+    def idle(self):
+        return self.still >= IDLE_AFTER
+
+    def wake(self):
+        self.still = 0
+
+    def stats(self):
+        return {'mode': self.mode, 'idle': self.idle,
+                'pushed': self.pushed / max(1, self.bands)}
+
+    def _changed(self, scr, h):
+        """Top rows of the bands that differ from the previous frame, or None
+        when there is no previous frame of this size to compare with."""
+        prev, bands = self.prev, range(0, h, DIRTY_BAND)
+        if np is not None and scr.get_bytesize() == 4:
+            buf = np.frombuffer(scr.get_buffer(), np.uint32).reshape(h, -1)
+            if prev is None or getattr(prev, 'shape', None) != buf.shape:
+                self.prev = buf.copy()
+                return None
+            changed = [y for y in bands
+                       if not np.array_equal(buf[y:y + DIRTY_BAND], prev[y:y + DIRTY_BAND])]
+            for y in changed:
+                prev[y:y + DIRTY_BAND] = buf[y:y + DIRTY_BAND]
+            return changed
+        buf = scr.get_buffer().raw
+        self.prev = buf
+        if prev is None or len(prev) != len(buf):
+            return None
+        pitch = scr.get_pitch()
+        step = DIRTY_BAND * pitch
+        return [y for y in bands
+                if buf[y * pitch:y * pitch + step] != prev[y * pitch:y * pitch + step]]
+
+    def present(self, scr):
+        self.frames += 1
+        if self.mode == 'flip':
+            pygame.display.flip()
+            return
+        w, h = scr.get_size()
+        n = (h + DIRTY_BAND - 1) // DIRTY_BAND
+        self.bands += n
+        changed = self._changed(scr, h)
+        if changed is None:
+            self.pushed += n
+            self.still = 0
+            pygame.display.flip()
+            return
+        rects = []
+        for y in changed:
+            bh = min(DIRTY_BAND, h - y)
+            if rects and rects[-1].bottom == y:
+                rects[-1].h += bh
+            else:
+                rects.append(pygame.Rect(0, y, w, bh))
+        self.pushed += len(changed)
+        if rects:
+            self.still = 0
+            pygame.display.update(rects)
+        else:
+            self.still += 1
 
-            alt = si % 2 == 0
-            gc = fog((20, 90, 20) if alt else (30, 120, 30), f)
-            rc = fog((44, 44, 44) if alt else (62, 62, 62), f)
-            kc = fog((220, 30, 30) if alt else (230, 230, 230), f)
 
-            if psy is not None and sy < psy:
-                iy = int(psy)
-                cy_n = int(sy)
-                lx, rx = sx - sw, sx + sw
-
-                # Grass
-                pygame.draw.rect(scr, gc, (0, cy_n, W, iy - cy_n))
-                # Road
-                pygame.draw.polygon(scr, rc,
-                    [(plx, iy), (prx, iy), (rx, cy_n), (lx, cy_n)])
-                # Kerbs
-                kw = max(1, sw // 10)
-                pygame.draw.polygon(scr, kc,
-                    [(plx, iy), (plx - kw, iy), (lx - kw, cy_n), (lx, cy_n)])
-                pygame.draw.polygon(scr, kc,
-                    [(prx, iy), (prx + kw, iy), (rx + kw, cy_n), (rx, cy_n)])
-                # Dashes
-                if alt and sw > 8:
-                    dw = max(1, sw // 25)
-                    wc = fog((255, 255, 255), f)
-                    pygame.draw.polygon(scr, wc,
-                        [(sx-dw, iy), (sx+dw, iy), (sx+dw, cy_n), (sx-dw, cy_n)])
-
-                # Guard rails
-                rlw = max(1, int(2.5 * sc * 2000))
-                rl_col = fog((160, 160, 170), f)
-                for side in [-1, 1]:
-                    bx = sx + side * (sw + int(5 * sc * 2000))
-                    pygame.draw.line(scr, rl_col, (bx, iy), (bx, cy_n), rlw)
+# ═══════════════════════════════════════════════════════════════════════════════
+# INSTRUMENTATION — per-stage frame timings, draw-call and surface counters
+# ═══════════════════════════════════════════════════════════════════════════════
+PROF_STAGES = ('upd', 'bg', 'road', 'sprites', 'player', 'hud', 'wait', 'scale', 'flip')
+PROF_WINDOW = 300           # frames behind the live p50/p95/p99
+PROF_KEEP   = 36000         # per-frame rows kept for the exit dump (10 min)
+DRAW_FNS = ('rect', 'polygon', 'circle', 'ellipse', 'arc', 'line', 'lines', 'aaline', 'aalines')
 
-                # Scenery
-                os_ = sc * 2000
-                for side, ot in seg.obj:
-                    ox = sx + side * (sw + int(40 * os_))
-                    oy = cy_n
-                    if ot == 'T':   sprites.append((oy, 'T', ox, oy, os_, f))
-                    elif ot == 'L': sprites.append((oy, 'L', ox, oy, os_, f))
-                    elif ot == 'B': sprites.append((oy, 'B', ox, oy, os_, f, si % 4))
 
-                # Enemy bikers!
-                for car in seg.cars:
-                    esx = sx + int(car['lane'] * sw)
-                    e_scale = sc * 2000
-                    if e_scale > 0.03:
-                        sprites.append((cy_n, 'E', esx, cy_n, e_scale, car['col']))
+def pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p / 100))] if xs else 0.0
 
-            plx, prx, psy = sx - sw, sx + sw, sy
+
+class Prof:
+    """Frame profiler: frame() opens a frame, lap(stage) closes a stage.
+
+    Timings are always collected (a few perf_counter calls per frame). hook()
+    additionally wraps pygame.draw.* and pygame.Surface to count draw calls
+    and surface allocations — it is opt-in since it patches pygame globally.
+    """
+    def __init__(self):
+        self.rows = deque(maxlen=PROF_KEEP)
+        self.counting = False
+        self.show = False
+        self._ov = None
+        self._ov_n = 0
+        self.reset()
+
+    def reset(self):
+        """Forget all samples; the next frame() starts a fresh series."""
+        self.win = {k: deque(maxlen=PROF_WINDOW) for k in PROF_STAGES + ('frame',)}
+        self.rows.clear()
+        self.cur = dict.fromkeys(PROF_STAGES, 0.0)
+        self.open = False
+        self.calls = self.surfs = 0
+        self.off = 0.0
+        self.t = time.perf_counter()
+
+    def hook(self):
+        if self.counting:
+            return
+        self.counting = True
+        prof = self
+
+        def counted(fn):
+            def wrap(*a, **k):
+                prof.calls += 1
+                return fn(*a, **k)
+            return wrap
+        for name in DRAW_FNS:
+            setattr(pygame.draw, name, counted(getattr(pygame.draw, name)))
+        base = pygame.Surface
+
+        class CountedSurface(base):
+            def __init__(self, *a, **k):
+                prof.surfs += 1
+                base.__init__(self, *a, **k)
+        pygame.Surface = CountedSurface
+        for name in ('scale', 'smoothscale', 'rotate', 'rotozoom', 'flip'):
+            fn = getattr(pygame.transform, name)
+
+            def alloc(*a, _fn=fn, **k):
+                prof.surfs += 1
+                return _fn(*a, **k)
+            setattr(pygame.transform, name, alloc)
+
+    def frame(self):
+        now = time.perf_counter()
+        if self.open:
+            self._commit()
+        self.open = True
+        self.cur = dict.fromkeys(PROF_STAGES, 0.0)
+        self.calls = self.surfs = 0
+        self.off = 0.0
+        self.t = now
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.cur[stage] += (now - self.t) * 1e3
+        self.t = now
+
+    def merge(self, laps, calls=0, surfs=0):
+        """Add stages timed in another process (a RenderWorker) to this frame.
+        They ran alongside this process's own, so `frame` leaves them out."""
+        for k, v in laps.items():
+            self.cur[k] += v
+        self.off += sum(laps.values())
+        self.calls += calls
+        self.surfs += surfs
+
+    def _commit(self):
+        cur = self.cur
+        cur['frame'] = sum(cur.values()) - self.off
+        for k, v in cur.items():
+            self.win[k].append(v)
+        cur['calls'], cur['surfs'] = self.calls, self.surfs
+        self.rows.append(cur)
+
+    def summary(self, rows=None):
+        """{stage: {p50, p95, p99, mean}} over `rows` (default: live window)."""
+        out = {}
+        for k in PROF_STAGES + ('frame',):
+            xs = list(self.win[k]) if rows is None else [r[k] for r in rows]
+            out[k] = {'p50': pct(xs, 50), 'p95': pct(xs, 95), 'p99': pct(xs, 99),
+                      'mean': sum(xs) / len(xs) if xs else 0.0}
+        return out
+
+    def dump(self, path, extra=None):
+        """Write <path>.json (percentiles + counters) and <path>.csv (per frame)."""
+        rows = list(self.rows)
+        stem = os.path.splitext(path)[0]
+        cols = PROF_STAGES + ('frame', 'calls', 'surfs')
+        with open(stem + '.csv', 'w') as f:
+            f.write(','.join(cols) + '\n')
+            for r in rows:
+                f.write(','.join(f"{r[k]:.4f}" if isinstance(r[k], float) else str(r[k])
+                                 for k in cols) + '\n')
+        info = {'frames': len(rows), 'stages_ms': self.summary(rows),
+                'counting': self.counting}
+        if self.counting and rows:
+            info['calls_per_frame'] = sum(r['calls'] for r in rows) / len(rows)
+            info['surfs_per_frame'] = sum(r['surfs'] for r in rows) / len(rows)
+        info.update(extra or {})
+        with open(stem + '.json', 'w') as f:
+            json.dump(info, f, indent=2)
+
+    def draw(self, surf, font, info=()):
+        """Overlay of per-stage percentiles; re-rendered twice a second."""
+        self._ov_n -= 1
+        if self._ov is None or self._ov_n <= 0:
+            self._ov_n = FPS // 2
+            lines = [f"{'stage':8}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+            for k, v in self.summary().items():
+                lines.append(f"{k:8}{v['p50']:7.2f}{v['p95']:7.2f}{v['p99']:7.2f}")
+            if self.counting and self.rows:
+                r = self.rows[-1]
+                lines.append(f"draw calls {r['calls']}  surfaces {r['surfs']}")
+            lines += list(info)
+            lh = font.get_linesize()
+            ov = self._ov = pygame.Surface((260, lh * len(lines) + 8), pygame.SRCALPHA)
+            ov.fill((0, 0, 0, 170))
+            for n, ln in enumerate(lines):
+                ov.blit(font.render(ln, True, (200, 255, 200)), (6, 4 + n * lh))
+        surf.blit(self._ov, (8, 56))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RENDER SCALE — internal resolution and the dynamic-resolution controller
+# ═══════════════════════════════════════════════════════════════════════════════
+RES_STEPS = (0.5, 0.625, 0.75, 0.875, 1.0)
+RES_DOWN  = 0.9         # step down when the smoothed frame cost exceeds this share of budget
+RES_UP    = 0.6         # step up when it falls below this share
+RES_HOLD  = FPS         # frames to wait after a change before judging again
+
+
+class ResScale:
+    """Picks the internal render scale from measured frame cost.
+
+    update(ms) takes one frame's work time (excluding the clock wait) and
+    keeps an exponential average. When it stays above RES_DOWN of the frame
+    budget the scale drops one step, below RES_UP it climbs back toward `top`.
+    Returns the new scale on a change, else None.
+    """
+    def __init__(self, top=1.0, budget=1000.0 / FPS):
+        self.steps = [k for k in RES_STEPS if k < top] + [top]
+        self.i = len(self.steps) - 1
+        self.budget = budget
+        self.ema = None
+        self.hold = RES_HOLD
+        self.changes = 0
+
+    @property
+    def k(self):
+        return self.steps[self.i]
+
+    def update(self, ms):
+        self.ema = ms if self.ema is None else self.ema + (ms - self.ema) * 0.1
+        self.hold -= 1
+        if self.hold > 0:
+            return None
+        if self.ema > self.budget * RES_DOWN and self.i > 0:
+            self.i -= 1
+        elif self.ema < self.budget * RES_UP and self.i < len(self.steps) - 1:
+            self.i += 1
+        else:
+            return None
+        self.hold = RES_HOLD
+        self.changes += 1
+        return self.k
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CANVAS — rasterizes a scene built by Game._scene()
+# ═══════════════════════════════════════════════════════════════════════════════
+ROAD_FILLS = ('poly', 'scan')     # road strips as pygame polygons / numpy scanline spans
+QUEUE_KINDS = ('T', 'L', 'B', 'E')    # drawing order within one depth bucket
+QUEUE_BOX = {'T': SPRITE_BOX['T'], 'L': SPRITE_BOX['L'], 'B': SPRITE_BOX['B'],
+             'E': SPRITE_BOX['bike']}
+
+
+class SpriteQueue:
+    """One frame's sprites, bucketed by the depth of the segment they stand on.
+
+    Each kind is a batch of typed parallel arrays (x, y, scale, fog, colour
+    or building index, window mask), reused from frame to frame. Game._scene()
+    visits segments far to near, so every batch is already in draw order:
+    `cnt[kind][d]` counts its sprites at depth d, `used` lists the depths in
+    the order they were pushed, and batches() walks it forwards (kinds in
+    QUEUE_KINDS order within a depth, the order Road builds seg.obj in),
+    with no sort. push() culls sprites whose box (QUEUE_BOX, times their
+    scale) lies outside the view.
+    """
+    def __init__(self, depth=DRAW_D + 1, cap=64):
+        self.depth = depth
+        self.cnt = {k: array('H', bytes(2 * depth)) for k in QUEUE_KINDS}
+        self.used = array('H', bytes(2 * depth))
+        self.x = {k: array('i', bytes(4 * cap)) for k in QUEUE_KINDS}
+        self.y = {k: array('i', bytes(4 * cap)) for k in QUEUE_KINDS}
+        self.sc = {k: array('d', bytes(8 * cap)) for k in QUEUE_KINDS}
+        self.f = {k: array('d', bytes(8 * cap)) for k in QUEUE_KINDS}
+        self.ci = {k: array('B', bytes(cap)) for k in QUEUE_KINDS}
+        self.win = {k: array('Q', bytes(8 * cap)) for k in QUEUE_KINDS}
+        self.n = dict.fromkeys(QUEUE_KINDS, 0)
+        self._zero = array('H', bytes(2 * depth))
+        self.begin(W, H)
+
+    def begin(self, vw, vh):
+        self.vw, self.vh = vw, vh
+        for k in QUEUE_KINDS:
+            if self.n[k]:
+                self.cnt[k][:] = self._zero
+                self.n[k] = 0
+        self.nused = 0
+        self.culled = 0
+
+    def _grow(self, k):
+        for a in (self.x, self.y, self.sc, self.f, self.ci, self.win):
+            a[k].extend(a[k])
+
+    def push(self, k, d, x, y, sc, f=0.0, ci=0, win=0):
+        l, t, r, b = QUEUE_BOX[k]
+        if x + r * sc < 0 or x - l * sc >= self.vw or y - t * sc >= self.vh or y + b * sc < 0:
+            self.culled += 1
+            return
+        n = self.n[k]
+        if n == len(self.x[k]):
+            self._grow(k)
+        self.x[k][n], self.y[k][n], self.sc[k][n], self.f[k][n] = x, y, sc, f
+        self.ci[k][n], self.win[k][n] = ci, win
+        self.n[k] = n + 1
+        if not self.nused or self.used[self.nused - 1] != d:
+            self.used[self.nused] = d
+            self.nused += 1
+        self.cnt[k][d] += 1
+
+    def batches(self):
+        """(kind, start, end) index ranges of each kind's arrays, far to near."""
+        start = dict.fromkeys(QUEUE_KINDS, 0)
+        for j in range(self.nused):
+            d = self.used[j]
+            for k in QUEUE_KINDS:
+                c = self.cnt[k][d]
+                if c:
+                    s = start[k]
+                    start[k] = s + c
+                    yield k, s, s + c
+
+    def __len__(self):
+        return sum(self.n.values())
+
+    def __getstate__(self):
+        """Pickle only the filled part (the scene goes to a RenderWorker)."""
+        st = dict(self.__dict__)
+        for a in ('x', 'y', 'sc', 'f', 'ci', 'win'):
+            st[a] = {k: v[:self.n[k]] for k, v in st[a].items()}
+        return st
+
+    def stats(self):
+        return {'queued': len(self), 'culled': self.culled}
+
+
+class Canvas:
+    """Everything needed to turn a scene into pixels: background, sprite and
+    text caches, fonts and particle dots. It holds no race state, so the
+    same code rasterizes in the game process or in a RenderWorker.
+
+    A scene is (state, quads, sprites, dots): a dict of the player/HUD
+    values, one tuple per visible road strip, a SpriteQueue and a
+    Particles.snap(). state['fill'] picks the road strip rasterizer.
+    """
+    def __init__(self, clouds, lod_bias=1.0, assets=False):
+        self.spr = SpriteCache(lod_bias=lod_bias)
+        self.assets = assets        # bitmap bikes and textured road (Atlas)
+        self.atlas = None
+        self.txt = TextCache()
+        self.bg = Background(clouds)
+        self.dots = Particles(0)
+        self.fonts = {}
+        self.scr = None
+
+    def _font(self, size, bold):
+        key = (round(size * self.ui), bold)
+        f = self.fonts.get(key)
+        if f is None:
+            f = self.fonts[key] = pygame.font.SysFont(None, key[0], bold=bold)
+        return f
+
+    def set_target(self, scr):
+        self.scr = scr
+        if self.assets and self.atlas is None:
+            self.atlas = self.spr.atlas = Atlas(scr)
+        self.vw, self.vh = scr.get_size()
+        self.ui = self.vh / H
+        self.hor = int(self.vh * 0.38)
+        self.fxl = self._font(52, True)
+        self.flg = self._font(36, True)
+        self.fmd = self._font(26, True)
+        self.fsm = self._font(20, False)
+
+    def raster(self, scene, pf):
+        st, quads, sprites, dots = scene
+        scr, spr, tc = self.scr, self.spr, self.txt
+        vw, vh, u, hor = self.vw, self.vh, self.ui, self.hor
+        sr = st['sr']
+        spr.begin()
+        # ── Sky, clouds, hills (pre-rendered) ──
+        self.bg.draw(scr, st['pos'])
+
+        # Fill below horizon with grass
+        pygame.draw.rect(scr, (20, 90, 20), (0, hor, vw, vh - hor))
+        pf.lap('bg')
+
+        # ── Road strips ──
+        if st['fill'] == 'scan' and np is not None and scr.get_bitsize() == 32:
+            self._strips_scan(quads)
+            quads = ()
+        tex = self.atlas
+        for gc, rc, kc, wc, rl_col, rlw, roff, sx, sw, cy_n, iy, plx, prx, si, f in quads:
+            lx, rx = sx - sw, sx + sw
+            # Grass
+            pygame.draw.rect(scr, gc, (0, cy_n, vw, iy - cy_n))
+            # Road
+            pts = [(plx, iy), (prx, iy), (rx, cy_n), (lx, cy_n)]
+            pygame.draw.polygon(scr, rc, pts)
+            if tex is not None and f < TEX_FOG:
+                # this segment's rows of the texture, from the mip matching the
+                # strip width, squashed to the strip and faded into the fog
+                x0, x1, tw = max(plx, 0), min(prx, vw), prx - plx
+                if x1 > x0:
+                    lv = Atlas.level(tex.road, tw)
+                    lw, q = lv.get_width(), lv.get_height() / tex.road[0].get_height()
+                    rows = max(1, int(tex.seg_rows * q))
+                    y0 = min(int((-si % TEX_SEGS) * tex.seg_rows * q), lv.get_height() - rows)
+                    u0 = (x0 - plx) * lw // tw
+                    u1 = max(u0 + 1, (x1 - plx) * lw // tw)
+                    band = pygame.transform.scale(lv.subsurface((u0, y0, u1 - u0, rows)),
+                                                  (x1 - x0, iy - cy_n))
+                    if f > 0:
+                        band.set_alpha(int(255 * (1 - f)))
+                    pygame.gfxdraw.textured_polygon(scr, pts, band, x0, cy_n)
+                    wc = None       # the texture has its own lane markings
+            # Kerbs
+            kw = max(1, sw // 10)
+            pygame.draw.polygon(scr, kc,
+                [(plx, iy), (plx - kw, iy), (lx - kw, cy_n), (lx, cy_n)])
+            pygame.draw.polygon(scr, kc,
+                [(prx, iy), (prx + kw, iy), (rx + kw, cy_n), (rx, cy_n)])
+            # Dashes
+            if wc is not None:
+                dw = max(1, sw // 25)
+                pygame.draw.polygon(scr, wc,
+                    [(sx-dw, iy), (sx+dw, iy), (sx+dw, cy_n), (sx-dw, cy_n)])
+            # Guard rails
+            for side in [-1, 1]:
+                bx = sx + side * (sw + roff)
+                pygame.draw.line(scr, rl_col, (bx, iy), (bx, cy_n), rlw)
+        pf.lap('road')
 
         # ── Draw sprites back-to-front ──
-        sprites.sort(key=lambda x: x[0])
-        for item in sprites:
-            k = item[1]
-            if k == 'T':
-                draw_tree(scr, item[2], item[3], item[4], item[5])
-            elif k == 'L':
-                draw_lamp(scr, item[2], item[3], item[4], item[5])
-            elif k == 'B':
-                draw_bldg(scr, item[2], item[3], item[4], item[5], item[6])
-            elif k == 'E':
-                ex, ey, e_sc, e_col = item[2], item[3], item[4], item[5]
-                # Enemy bike with spinning wheels too
-                e_lean = math.sin(self.pos * 0.01 + ex * 0.1) * 0.3
-                draw_bike(scr, ex, ey, e_sc * 0.8, e_lean,
-                          self.wheel_angle * 0.7, sr * 0.6,
-                          body_col=e_col, is_player=False)
-
-        # ── Sparks ──
-        for sp in self.sparks:
-            sp.draw(scr)
+        q = sprites
+        for k, s, e in q.batches():
+            xs, ys, scs, fs = q.x[k], q.y[k], q.sc[k], q.f[k]
+            for i in range(s, e):
+                if k == 'E':
+                    # Enemy bike with spinning wheels too
+                    ex = xs[i]
+                    e_lean = math.sin(st['pos'] * 0.01 + ex * 0.1) * 0.3
+                    spr.bike(scr, ex, ys[i], scs[i], e_lean,
+                             st['wheel_angle'] * 0.7, sr * 0.6,
+                             body_col=RIDER_COLS[q.ci[k][i]], is_player=False)
+                elif k == 'B':
+                    spr.scenery(scr, k, xs[i], ys[i], scs[i], fs[i], q.ci[k][i], q.win[k][i])
+                else:
+                    spr.scenery(scr, k, xs[i], ys[i], scs[i], fs[i])
+
+        # ── Particles ──
+        self.dots.blit(scr, dots)
+        pf.lap('sprites')
 
         # ── Player bike (animated!) ──
-        bob_y = int(math.sin(self.bob) * 3.5 * sr)
-        px_scr = W // 2 + int(self.lean * 60)
-        draw_bike(scr, px_scr, H - 55 + bob_y, 1.0,
-                  self.lean, self.wheel_angle, sr,
-                  body_col=(30, 100, 220), is_player=True)
+        bob_y = int(math.sin(st['bob']) * 3.5 * sr * u)
+        px_scr = vw // 2 + int(st['lean'] * 60 * u)
+        spr.bike(scr, px_scr, vh - int(55 * u) + bob_y, u,
+                 st['lean'], st['wheel_angle'], sr,
+                 body_col=(30, 100, 220), is_player=True)
+        pf.lap('player')
 
         # ── Speed lines at high speed ──
         if sr > 0.6:
+            ll = int(sr * 30 * u)
+            la = int(60 * (sr - 0.6) / 0.4)
+            ls = tc.panel(max(1, int(2 * u)), ll, (255, 255, 255, la))
             for _ in range(int(sr * 8)):
-                lx = random.randint(0, W)
-                ly = random.randint(HOR, H)
-                ll = int(sr * 30)
-                la = int(60 * (sr - 0.6) / 0.4)
-                ls = pygame.Surface((2, ll), pygame.SRCALPHA)
-                ls.fill((255, 255, 255, la))
+                lx = random.randint(0, vw)
+                ly = random.randint(hor, vh)
                 scr.blit(ls, (lx, ly))
 
         # ── HUD ──
-        hud = pygame.Surface((W, 48), pygame.SRCALPHA)
-        hud.fill((10, 10, 30, 180))
-        scr.blit(hud, (0, 0))
+        scr.blit(tc.panel(vw, int(48 * u), (10, 10, 30, 180)), (0, 0))
         kmh = int(sr * 220)
-        scr.blit(self.fmd.render(f"Speed: {kmh} km/h", True, (255, 220, 50)), (12, 13))
-        scr.blit(self.fmd.render(f"Score: {self.score}", True, (255, 255, 255)), (W - 200, 13))
-        bw = int(sr * 200)
-        pygame.draw.rect(scr, (40, 40, 40), (W//2-100, 16, 200, 16), border_radius=8)
+        ty = int(13 * u)
+        scr.blit(tc.text(self.fmd, f"Speed: {kmh} km/h", (255, 220, 50)), (int(12 * u), ty))
+        scr.blit(tc.text(self.fmd, f"Score: {st['score']}", (255, 255, 255)), (vw - int(200 * u), ty))
+        bar = (vw // 2 - int(100 * u), int(16 * u), int(200 * u), int(16 * u))
+        br = int(8 * u)
+        bw = int(sr * 200 * u)
+        pygame.draw.rect(scr, (40, 40, 40), bar, border_radius=br)
         bc = (50, 220, 50) if sr < 0.6 else (255, 180, 0) if sr < 0.85 else (255, 60, 60)
         if bw > 0:
-            pygame.draw.rect(scr, bc, (W//2-100, 16, bw, 16), border_radius=8)
-        pygame.draw.rect(scr, (180, 180, 180), (W//2-100, 16, 200, 16), 1, border_radius=8)
-        scr.blit(self.fsm.render("↑↓ Speed  ←→ Steer  ENTER/SPACE Start  ESC Quit",
-                                 True, (140, 140, 140)), (W//2 - 195, H - 20))
+            pygame.draw.rect(scr, bc, (bar[0], bar[1], bw, bar[3]), border_radius=br)
+        pygame.draw.rect(scr, (180, 180, 180), bar, 1, border_radius=br)
+        scr.blit(tc.text(self.fsm, "↑↓ Speed  ←→ Steer  ENTER/SPACE Start  ESC Quit",
+                         (140, 140, 140)), (vw // 2 - int(195 * u), vh - int(20 * u)))
 
         # ── Overlays ──
-        if not self.go and not self.dead:
-            ov = pygame.Surface((W, H), pygame.SRCALPHA)
-            ov.fill((0, 0, 0, 90))
-            scr.blit(ov, (0, 0))
+        if not st['go'] and not st['dead']:
+            scr.blit(tc.panel(vw, vh, (0, 0, 0, 90)), (0, 0))
             for txt, y, col, fn in [
-                ("ROAD RASH 3D",                 H//2 - 100, (230, 50, 50),  self.fxl),
-                ("Dodge enemy bikers!",           H//2 - 45,  (220, 220, 220), self.fmd),
-                ("Press ENTER or SPACE to Race",  H//2 + 5,   (255, 220, 50), self.flg),
-                ("ESC to Quit",                   H//2 + 60,  (150, 150, 150), self.fsm),
+                ("ROAD RASH 3D",                 -100, (230, 50, 50),  self.fxl),
+                ("Dodge enemy bikers!",           -45, (220, 220, 220), self.fmd),
+                ("Press ENTER or SPACE to Race",    5, (255, 220, 50), self.flg),
+                ("ESC to Quit",                    60, (150, 150, 150), self.fsm),
             ]:
-                ts = fn.render(txt, True, col)
-                scr.blit(ts, (W//2 - ts.get_width()//2, y))
+                ts = tc.text(fn, txt, col)
+                scr.blit(ts, (vw // 2 - ts.get_width() // 2, vh // 2 + int(y * u)))
 
-        elif self.dead:
-            ov = pygame.Surface((W, H), pygame.SRCALPHA)
-            ov.fill((100, 0, 0, 110))
-            scr.blit(ov, (0, 0))
+        elif st['dead']:
+            scr.blit(tc.panel(vw, vh, (100, 0, 0, 110)), (0, 0))
             for txt, y, col, fn in [
-                ("CRASHED!",                      H//2 - 80, (255, 80, 80),  self.fxl),
-                (f"Score: {self.score}",           H//2 - 10, (255, 255, 255), self.flg),
-                ("Press ENTER or SPACE to Retry",  H//2 + 50, (255, 220, 50), self.fmd),
+                ("CRASHED!",                      -80, (255, 80, 80),  self.fxl),
+                (f"Score: {st['score']}",          -10, (255, 255, 255), self.flg),
+                ("Press ENTER or SPACE to Retry",   50, (255, 220, 50), self.fmd),
             ]:
-                ts = fn.render(txt, True, col)
-                scr.blit(ts, (W//2 - ts.get_width()//2, y))
+                ts = tc.text(fn, txt, col)
+                scr.blit(ts, (vw // 2 - ts.get_width() // 2, vh // 2 + int(y * u)))
+        pf.lap('hud')
+
+    def _strips_scan(self, quads):
+        """Fill the road strips in one batched pass over the frame buffer.
+
+        Each row belongs to the last strip covering it (painter's order). Per
+        row the strip's edges are interpolated from its near to its far end
+        and sorted into runs; each run takes the colour of the topmost layer
+        over it (grass, road, kerb, dash, rail), and one np.repeat expands
+        every row's runs into pixels. Flat colours only: road textures need
+        the 'poly' path.
+        """
+        if not quads:
+            return
+        scr = self.scr
+        vw, vh = self.vw, self.vh
+        own = np.full(vh, -1, np.int32)
+        for k, q in enumerate(quads):
+            own[max(0, q[9]):max(0, min(q[10], vh))] = k
+        ys = np.flatnonzero(own >= 0)
+        if not len(ys):
+            return
+        qi = own[ys]
+        rlw, roff, sx, sw, cy, iy, plx, prx = np.array([q[5:13] for q in quads], np.float64)[qi].T
+        t = (iy - ys) / np.maximum(iy - cy, 1)          # 0 at the near edge, 1 at the far one
+        xl = plx + (sx - sw - plx) * t
+        xr = prx + (sx + sw - prx) * t
+        kw = np.maximum(1, sw // 10)
+        dw = np.maximum(1, sw // 25)
+        dw[np.array([q[3] is None for q in quads])[qi]] = 0
+        bl = sx - (sw + roff) - rlw // 2
+        br = sx + (sw + roff) - rlw // 2
+        # (layer, start, end) in drawing order; a pixel x is inside when start <= x < end
+        spans = [(1, xl, xr), (2, xl - kw, xl), (2, xr, xr + kw), (3, sx - dw, sx + dw),
+                 (4, bl, bl + rlw), (4, br, br + rlw)]
+        edge = np.clip(np.ceil(np.stack([e for _, a, b in spans for e in (a, b)], 1)), 0, vw)
+        cuts = np.sort(np.hstack([np.zeros((len(ys), 1)), edge, np.full((len(ys), 1), vw)]), 1)
+        run, x0 = np.diff(cuts, axis=1).astype(np.intp), cuts[:, :-1]
+        lay = np.zeros(run.shape, np.intp)
+        for k, (n, a, b) in enumerate(spans):
+            lay[(x0 >= edge[:, 2 * k:2 * k + 1]) & (x0 < edge[:, 2 * k + 1:2 * k + 2])] = n
+        # Layer colours per strip as mapped pixels
+        rgb = np.array([q[:3] + (q[3] or (0, 0, 0), q[4]) for q in quads], np.uint32)
+        sh, mk = scr.get_shifts(), scr.get_masks()
+        pix = (rgb[..., 0] << sh[0] | rgb[..., 1] << sh[1] | rgb[..., 2] << sh[2]
+               | mk[3]).astype(np.uint32)[qi]
+        rows = np.repeat(np.take_along_axis(pix, lay, 1).ravel(), run.ravel())
+        px = pygame.surfarray.pixels2d(scr)
+        px[:, ys] = rows.reshape(len(ys), vw).T
+        del px
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RENDER WORKER — rasterize on a second process into shared-memory frames
+# ═══════════════════════════════════════════════════════════════════════════════
+# Shared frames use the byte order of SRCALPHA sprites and the usual XRGB8888
+# window so blits stay on SDL's fast paths; draws are opaque, so alpha stays 255.
+FRAME_FMT = 'BGRA'
+
+
+def _render_main(conn, names, size, clouds, lod_bias, assets, count):
+    """Worker process: rasterize each (buffer, scene) received into that
+    shared frame and reply (buffer, stage ms, (draw calls, surfaces), cache
+    stats); None shuts it down."""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    pygame.font.init()
+    shms = [shared_memory.SharedMemory(name=n) for n in names]
+    frames = [pygame.image.frombuffer(m.buf, size, FRAME_FMT) for m in shms]
+    # One private target: SDL re-encodes RLE sprites whenever the blit
+    # destination changes, so drawing straight into both buffers would
+    # re-encode every cached sprite every frame. Copying costs a blit.
+    scr = pygame.Surface(size, 0, frames[0])
+    cv = Canvas(clouds, lod_bias, assets)
+    cv.set_target(scr)
+    pf = Prof()
+    if count:
+        pf.hook()
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            idx, scene = msg
+            pf.frame()
+            cv.raster(scene, pf)
+            frames[idx].blit(scr, (0, 0))
+            pf.lap('flip')
+            laps = {k: v for k, v in pf.cur.items() if v}
+            conn.send((idx, laps, (pf.calls, pf.surfs),
+                       {'sprite_cache': cv.spr.stats(), 'text_cache': cv.txt.stats()}))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del frames, scr, cv
+        for m in shms:
+            m.close()
+
+
+class RenderWorker:
+    """Pipelined rasterizer: a spawned process draws frame N into one of two
+    shared-memory buffers while the game simulates and builds frame N+1.
+
+    swap(scene) hands over the next scene and returns the previous frame as
+    a Surface over the shared buffer (no pixel copy through the pipe); the
+    buffer stays untouched until the following swap(). Frames are shown
+    one frame later than in-process rendering. The first swap() waits for
+    its own frame, so nothing blank is ever returned.
+
+    Each returned frame comes with the worker's stage times (`laps`), draw
+    counts when `count` is set (Prof.hook) and cache `stats`, for the
+    game's Prof.merge(), overlay and dump.
+    """
+    def __init__(self, size, clouds, lod_bias=1.0, assets=False, count=False):
+        w, h = size
+        ctx = mp.get_context('spawn')
+        self.shm = [shared_memory.SharedMemory(create=True, size=w * h * 4) for _ in range(2)]
+        self.frames = [pygame.image.frombuffer(m.buf, size, FRAME_FMT) for m in self.shm]
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_render_main, daemon=True,
+                                args=(child, [m.name for m in self.shm], size, clouds, lod_bias,
+                                      assets, count))
+        self.proc.start()
+        child.close()
+        self.n = 0
+        self.pending = False
+        self.last = None        # buffer index of the last returned frame
+        self.laps = {}          # worker stage ms of the last returned frame
+        self.counts = (0, 0)    # its draw calls and surfaces (count=True)
+        self.stats = {'sprite_cache': None, 'text_cache': None}
+
+    @property
+    def ms(self):
+        """Worker raster time of the last returned frame."""
+        return sum(self.laps.values())
+
+    def swap(self, scene):
+        self.laps, self.counts = {}, (0, 0)     # a frame returned again was merged already
+        if self.pending:
+            self.last, self.laps, self.counts, self.stats = self.conn.recv()
+        self.conn.send((self.n % 2, scene))
+        self.n += 1
+        self.pending = True
+        if self.last is None:
+            self.last, self.laps, self.counts, self.stats = self.conn.recv()
+            self.pending = False
+        return self.frames[self.last]
+
+    def close(self):
+        try:
+            if self.pending:
+                self.conn.recv()
+            self.conn.send(None)
+        except (OSError, EOFError):
+            pass
+        self.proc.join(2)
+        self.frames = None
+        for m in self.shm:
+            m.close()
+            m.unlink()
 
 
-def main():
-    Game().run()
+# ═══════════════════════════════════════════════════════════════════════════════
+# GAME
+# ═══════════════════════════════════════════════════════════════════════════════
+class Game(Sim):
+    def __init__(self, prof_out=None, display='flip', size=(W, H), scale=1.0, dynres=False,
+                 lod_bias=1.0, hz=SIM_HZ, fps=FPS, road=None, worker=False, record=None,
+                 assets=False, road_fill='poly', on_first_frame=None):
+        if not 0.25 <= scale <= 1.0:
+            raise ValueError(f"render scale must be in [0.25, 1], not {scale}")
+        if worker and dynres:
+            raise ValueError("the render worker uses a fixed render scale; drop dynres")
+        self.disp = Display(display)
+        self.road_fill = road_fill
+        self.on_first_frame = on_first_frame     # called with time.time() once shown
+        self.sim_dt = 1.0 / hz
+        self.fps = fps              # render cap; 0 = uncapped
+        self.prev = None            # LERP state before the last tick
+        self.prof = Prof()
+        self.prof_out = prof_out
+        if prof_out:
+            self.prof.hook()
+        pygame.init()
+        self.win = pygame.display.set_mode(size)
+        pygame.display.set_caption("Road Rash 3D")
+        self.clk = pygame.time.Clock()
+        self.fmono = pygame.font.SysFont("monospace", 13)
+        self.clouds = [(random.randint(0, W), random.randint(8, HOR - 30),
+                        random.randint(60, 160)) for _ in range(10)]
+        # With a worker the Canvas (and its caches and atlas) live over there
+        self.cv = None if worker else Canvas(self.clouds, lod_bias, assets)
+        self.spr, self.txt, self.bg = (None,) * 3 if worker else (self.cv.spr, self.cv.txt, self.cv.bg)
+        self.dyn = ResScale(scale) if dynres else None
+        self.set_scale(scale)
+        self.rw = (RenderWorker((self.vw, self.vh), self.clouds, lod_bias, assets, bool(prof_out))
+                   if worker else None)
+        road = road or course_road(['ring', random.randrange(1 << 30)])
+        self.rec = Recorder(record, road, hz, RIDERS) if record else None
+        self.sq = SpriteQueue()
+        Sim.__init__(self, road=road)
+
+    def reset(self, seed=None):
+        """Each race gets its own seed so a Recorder can log it."""
+        if seed is None:
+            seed = random.randrange(1 << 30)
+        Sim.reset(self, seed)
+        if self.rec is not None:
+            self.rec.start(seed)
+
+    def set_scale(self, k):
+        """Render into an internal surface k times the window size (the window
+        itself at k == 1); _compose() scales it up to the window."""
+        ww, wh = self.win.get_size()
+        self.k = k
+        self.scr = self.win if k >= 1 else pygame.Surface((int(ww * k), int(wh * k)), 0, self.win)
+        if self.cv is not None:
+            self.cv.set_target(self.scr)
+        self.vw, self.vh = self.scr.get_size()
+        self.ui, self.hor = self.vh / H, int(self.vh * 0.38)
+
+    def run(self):
+        """Fixed-timestep loop: the race advances in sim_dt ticks drained from
+        an accumulator, and each frame renders the state `alpha` of the way
+        from the previous tick to the latest, so motion stays smooth at any
+        render rate and gameplay does not depend on it."""
+        pf = self.prof
+        acc = 0.0
+        while True:
+            dt = self.clk.tick(IDLE_FPS if self.disp.idle else self.fps) / 1000.0
+            pf.frame()
+            if not self.go and not self.dead:
+                self.pos = (self.pos + self.mspd * 0.35 * dt) % self.road.length
+                self.wheel_angle += 3.0 * dt  # slow spin on title
+            for ev in pygame.event.get():
+                self.disp.wake()
+                if ev.type == pygame.QUIT: self._quit(); return
+                if ev.type == pygame.KEYDOWN:
+                    if ev.key == pygame.K_ESCAPE: self._quit(); return
+                    if ev.key == pygame.K_F3:
+                        pf.show = not pf.show
+                    if ev.key == pygame.K_F4:
+                        self.road_fill = ROAD_FILLS[1 - ROAD_FILLS.index(self.road_fill)]
+                    if ev.key in (pygame.K_RETURN, pygame.K_SPACE):
+                        if not self.go or self.dead:
+                            self.reset()
+                            self.go = True
+                            self.prev, acc = None, 0.0
+            alpha = 0.0
+            if self.go and not self.dead:
+                acc += dt
+                n = 0
+                while acc >= self.sim_dt and not self.dead:
+                    if n == MAX_TICKS:      # too far behind: slow down rather than spiral
+                        acc = 0.0
+                        break
+                    self.prev = [getattr(self, k) for k in LERP]
+                    self._upd(self.sim_dt)
+                    acc -= self.sim_dt
+                    n += 1
+                alpha = acc / self.sim_dt if not self.dead else 0.0
+            elif self.dead:
+                self.settle(dt)     # let crash debris settle
+            pf.lap('upd')
+            sc = self._lerped(alpha) if alpha and self.prev else self._scene()
+            pf.lap('road')
+            if self.rw is None:
+                self.cv.raster(sc, pf)
+                self._compose()
+            else:
+                fr = self.rw.swap(sc)
+                pf.lap('wait')
+                pf.merge(self.rw.laps, *self.rw.counts)
+                self._compose(fr)
+            self.disp.present(self.win)
+            if self.on_first_frame is not None:
+                self.on_first_frame(time.time())
+                self.on_first_frame = None
+            pf.lap('flip')
+            if self.dyn is not None and not self.disp.idle:
+                k = self.dyn.update(sum(pf.cur.values()))
+                if k is not None:
+                    self.set_scale(k)
+
+    def _lerped(self, alpha):
+        """_scene() of the state `alpha` of the way from the previous tick."""
+        cur = [getattr(self, k) for k in LERP]
+        for k, a, b in zip(LERP, self.prev, cur):
+            if k == 'pos' and b < a:        # wrapped past the end of the track
+                b += self.road.length
+            setattr(self, k, a + (b - a) * alpha)
+        self.pos %= self.road.length
+        try:
+            return self._scene()
+        finally:
+            for k, v in zip(LERP, cur):
+                setattr(self, k, v)
+
+    def _compose(self, src=None):
+        """Scale the finished frame (default: the internal surface) up to the
+        window and draw the F3 overlay there, so it stays legible at any
+        render scale."""
+        pf = self.prof
+        src = self.scr if src is None else src
+        if src is not self.win:
+            if src.get_size() == self.win.get_size():
+                self.win.blit(src, (0, 0))
+            else:
+                pygame.transform.scale(src, self.win.get_size(), self.win)
+        if pf.show:
+            c = self.counters()
+            sc, fx, tx = c['sprite_cache'], c['particles'], c['text_cache']
+            hit = 100 * sc['hits'] / max(1, sc['hits'] + sc['misses'])
+            pf.draw(self.win, self.fmono, (
+                f"sprites {sc['entries']} ({sc['bytes'] >> 20} MB) hit {hit:.0f}%"
+                f"  queued {c['sprite_queue']['queued']} culled {c['sprite_queue']['culled']}",
+                f"text {tx['entries']} cached, {tx['misses']} rendered",
+                f"particles {fx['live']}/{fx['capacity']} peak {fx['peak']}",
+                "lod " + "  ".join(f"{k} " + "/".join(map(str, v))
+                                   for k, v in sc['lod'].items() if k != 'B'),
+                f"riders {c['riders']}   display {c['display']['mode']}"
+                f" {100 * c['display']['pushed']:.0f}% pushed",
+                f"render {self.vw}x{self.vh} ({self.k:g}x) road {self.road_fill}"
+                + (f" dyn {self.dyn.changes} changes" if self.dyn else "")
+                + (f" worker {self.rw.ms:.1f} ms" if self.rw else ""),
+                "F3 hide  F4 road fill"))
+        pf.lap('scale')
+
+    def _quit(self):
+        if self.rec is not None:
+            self.rec.close(self)
+        if self.rw is not None:
+            self.rw.close()
+        if self.prof_out:
+            self.prof.dump(self.prof_out, {'counters': self.counters()})
+        pygame.quit()
+
+    def counters(self):
+        """Cache and pool usage shown in the overlay and written to the dump."""
+        caches = (self.rw.stats if self.rw is not None else
+                  {'sprite_cache': self.spr.stats(), 'text_cache': self.txt.stats()})
+        return {'sprite_cache': caches['sprite_cache'], 'sprite_queue': self.sq.stats(),
+                'text_cache': caches['text_cache'], 'particles': self.fx.stats(),
+                'riders': self.riders.n, 'display': self.disp.stats(),
+                'render': {'size': [self.vw, self.vh], 'scale': self.k,
+                           'dyn_changes': self.dyn.changes if self.dyn else 0,
+                           'worker': self.rw is not None}}
+
+    def _upd(self, dt):
+        inp = key_input(pygame.key.get_pressed())
+        self.step(dt, inp)
+        if self.rec is not None:
+            self.rec.tick(inp)
+            if self.dead:
+                self.rec.end(self)
+
+    def _scene(self):
+        """Project the road and collect what the Canvas draws this frame, as
+        plain data that pickles cheaply to a RenderWorker."""
+        vw, vh, u = self.vw, self.vh, self.ui
+        rd = self.road
+        if (rd.vw, rd.vh) != (vw, vh):
+            rd.set_view(vw, vh)
+        si0 = int(self.pos / SEG_L) % rd.n
+        cam_x = self.px * ROAD_W
+        fogc, rs = rd.fogc, self.riders
+
+        plx = prx = psy = None
+        quads, sq = [], self.sq
+        sq.begin(vw, vh)
+        for i, si, sx, sy, vis in zip(*rd.project(si0, cam_x)):
+            if not vis:
+                continue
+            sw = rd.dsw[i]
+            if psy is not None and sy < psy:
+                sc = rd.dsc[i]
+                seg = rd.get(si)
+                f = rd.dfog[i]
+                alt = si % 2 == 0
+                iy = int(psy)
+                cy_n = int(sy)
+                quads.append((fogc[GRASS_C[alt]][i], fogc[ROAD_C[alt]][i], fogc[KERB_C[alt]][i],
+                              fogc[DASH_C][i] if alt and sw > 8 else None, fogc[RAIL_C][i],
+                              max(1, int(2.5 * sc * 2000 * u)), int(5 * sc * 2000 * u),
+                              sx, sw, cy_n, iy, plx, prx, si, f))
+
+                # Scenery
+                os_ = sc * 2000 * u
+                for side, ot in seg.obj:
+                    ox_ = sx + side * (sw + int(40 * os_))
+                    oy = cy_n
+                    if ot == 'B':
+                        sq.push('B', i, ox_, oy, os_, f, si % 4, seg.win)
+                    else:
+                        sq.push(ot, i, ox_, oy, os_, f)
+
+                # Enemy bikers!
+                e_scale = sc * 2000 * u
+                if e_scale > 0.03 * u:
+                    ri = si % N_SEG
+                    for k in range(rs.start[ri], rs.start[ri + 1]):
+                        esx = sx + int(rs.slane[k] * sw)
+                        sq.push('E', i, esx, cy_n, e_scale * 0.8, ci=rs.scol[k])
+
+            plx, prx, psy = sx - sw, sx + sw, sy
+
+        st = {'pos': self.pos, 'sr': self.spd / max(self.mspd, 0.01), 'lean': self.lean,
+              'bob': self.bob, 'wheel_angle': self.wheel_angle, 'score': self.score,
+              'go': self.go, 'dead': self.dead, 'fill': self.road_fill}
+        return st, quads, sq, self.fx.snap(u, vw / 2 - W / 2 * u)
+
+    def _drw(self):
+        """Build and rasterize one frame in-process into self.scr."""
+        sc = self._scene()
+        self.prof.lap('road')
+        self.cv.raster(sc, self.prof)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WARM HOST — a process with everything but the window ready, launching on request
+# ═══════════════════════════════════════════════════════════════════════════════
+# A Unix socket in a private directory, or a randomly named pipe on Windows,
+# authenticated with a per-host secret: ROADRASH_HOST_KEY (the launcher
+# passes one) or a fresh key that the host prints with its address.
+def host_addr():
+    """A new address for a host: `host.sock` in a fresh 0700 directory, or a
+    pipe name nobody can guess on Windows."""
+    if os.name == 'nt':
+        return rf'\\.\pipe\roadrash-{secrets.token_hex(8)}'
+    return os.path.join(tempfile.mkdtemp(prefix="roadrash-"), "host.sock")
+
+
+def warm():
+    """Do the launch work that opens no window: font lookups (SysFont's
+    font list is cached per process) and a spare course."""
+    pygame.font.init()
+    pygame.font.SysFont("monospace", 13)
+    pygame.font.SysFont(None, 20)
+    return course_road(['ring', random.randrange(1 << 30)])
+
+
+def host(addr=None, key=None):
+    """Serve ('launch', argv, t0) requests on addr (default: host_addr())
+    until ('stop',). The first line on stdout is `host: ready on ADDR`,
+    followed by ` key KEY` when the key was generated here.
+
+    Each launch forks a child off the warm process that runs main(argv) on
+    the spare course; the reply is ('started', pid) and the child then sends
+    ('first_frame', ms since t0) on the same connection. The display is only
+    initialized in the child. Without fork (Windows) the game runs in the
+    host itself, one at a time, and the host re-warms afterwards.
+    """
+    key = key or os.environ.get('ROADRASH_HOST_KEY')
+    shown = ""
+    if not key:
+        key = secrets.token_hex(16)
+        shown = f" key {key}"
+    own, addr = addr is None, addr or host_addr()
+    if os.name == 'posix' and os.path.lexists(addr):
+        # only a stale socket of a host that did not exit cleanly is replaced
+        if not stat.S_ISSOCK(os.lstat(addr).st_mode):
+            raise FileExistsError(f"{addr}: exists and is not a socket")
+        os.unlink(addr)
+    road = warm()
+    with Listener(addr, authkey=key.encode()) as ls:
+        print(f"host: ready on {addr}{shown}", flush=True)
+        while True:
+            with ls.accept() as conn:
+                msg = conn.recv()
+                if msg[0] == 'stop':
+                    conn.send(('stopped',))
+                    break
+                _, argv, t0 = msg
+                ff = lambda t, c=conn: c.send(('first_frame', (t - t0) * 1e3))
+                if not hasattr(os, 'fork'):
+                    conn.send(('started', os.getpid()))
+                    main(argv, road, ff)
+                    pygame.quit()
+                elif (pid := os.fork()) == 0:
+                    code = 0
+                    try:
+                        main(argv, road, ff)
+                    except BaseException:
+                        import traceback
+                        traceback.print_exc()
+                        code = 1
+                    os._exit(code)      # no atexit/finalizers: they belong to the host
+                else:
+                    conn.send(('started', pid))
+            road = warm()
+            while hasattr(os, 'waitpid') and os.name == 'posix':
+                try:
+                    if os.waitpid(-1, os.WNOHANG)[0] == 0:
+                        break
+                except ChildProcessError:
+                    break
+    if own and os.name == 'posix':
+        os.rmdir(os.path.dirname(addr))     # the Listener removed the socket
+
+
+def launch(argv, addr, key):
+    """Ask the warm host at addr to start a game; returns the open
+    connection, which then yields ('started', pid) and ('first_frame', ms)."""
+    conn = Client(addr, authkey=key.encode())
+    conn.send(('launch', list(argv), time.time()))
+    return conn
+
+
+def size_arg(v):
+    try:
+        w, h = map(int, v.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WxH, got {v!r}")
+    return w, h
+
+
+def main(argv=None, warm_road=None, on_first_frame=None):
+    ap = argparse.ArgumentParser(description="Road Rash 3D")
+    ap.add_argument("--prof", metavar="PATH",
+                    help="count draw calls/surfaces and dump PATH.json/.csv at exit")
+    ap.add_argument("--display", choices=DISPLAY_MODES, default='flip',
+                    help="'dirty' pushes only changed bands and idles at "
+                         f"{IDLE_FPS} FPS on static screens (kiosks)")
+    ap.add_argument("--size", metavar="WxH", default=f"{W}x{H}", type=size_arg,
+                    help=f"window size (default {W}x{H})")
+    ap.add_argument("--scale", type=float, default=1.0,
+                    help="internal render scale 0.25..1, upscaled to the window")
+    ap.add_argument("--dynres", action="store_true",
+                    help="lower/raise the render scale (up to --scale) to hold "
+                         f"{FPS} FPS")
+    ap.add_argument("--hz", type=float, default=SIM_HZ,
+                    help=f"fixed simulation rate (default {SIM_HZ})")
+    ap.add_argument("--fps", type=int, default=FPS,
+                    help=f"render rate cap, 0 = uncapped (default {FPS})")
+    ap.add_argument("--endless", nargs="?", const=0, type=int, metavar="SEED",
+                    help="race an endless streamed track generated from SEED")
+    ap.add_argument("--track", metavar="PATH", help="race a course saved with --export-track")
+    ap.add_argument("--export-track", metavar="PATH",
+                    help="save the course (ring, or the first --export-len segments of "
+                         "--endless) as a track file and exit")
+    ap.add_argument("--export-len", type=int, default=1 << 16, metavar="N")
+    ap.add_argument("--worker", action="store_true",
+                    help="rasterize on a second process, pipelined one frame behind")
+    ap.add_argument("--lod-bias", type=float, default=1.0,
+                    help="multiply the LOD thresholds: >1 simplifies sooner, 0 disables LOD")
+    ap.add_argument("--assets", action="store_true",
+                    help="bitmap bikes and a textured road from src/assets")
+    ap.add_argument("--road-fill", choices=ROAD_FILLS, default='poly',
+                    help="road strips as polygons or batched numpy scanlines (F4 toggles)")
+    ap.add_argument("--host", nargs="?", const="", metavar="ADDR",
+                    help="run a warm launch host (see launch()) instead of a game; key "
+                         "from ROADRASH_HOST_KEY, else generated and printed")
+    ap.add_argument("--t0", type=float, metavar="EPOCH",
+                    help="print the time from EPOCH (time.time()) to the first frame")
+    ap.add_argument("--record", metavar="PATH",
+                    help="log every race's seed and inputs to a replay file (see replay.py)")
+    a = ap.parse_args(argv)
+    if a.host is not None:
+        return host(a.host or None)
+    if a.t0 is not None:
+        on_first_frame = lambda t: print(f"first frame {(t - a.t0) * 1e3:.0f} ms", flush=True)
+    road = (MappedRoad(a.track) if a.track else
+            Track(a.endless) if a.endless is not None else warm_road)
+    if a.export_track:
+        road = road or Road()
+        save_track(road, a.export_track, a.export_len if road.n > 1 << 31 else None)
+        print(f"{a.export_track}: {os.path.getsize(a.export_track)} bytes")
+        return
+    Game(prof_out=a.prof, display=a.display, size=a.size, scale=a.scale,
+         dynres=a.dynres, lod_bias=a.lod_bias, hz=a.hz, fps=a.fps,
+         road=road, worker=a.worker, record=a.record, assets=a.assets,
+         road_fill=a.road_fill, on_first_frame=on_first_frame).run()
 
 if __name__ == "__main__":
     main()
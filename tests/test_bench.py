@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip("pygame")
+import bench
+import roadrash as rr
+
+
+@pytest.mark.parametrize("name", [n for n, (racing, _, _) in bench.SCENARIOS.items() if racing])
+def test_racing_scenarios_stay_racing(name):
+    g = rr.Game()
+    bench.setup(g, name, 1)
+    for _ in range(60 + 600):           # bench frame's warmup and timed frames
+        bench.advance(g)
+        assert g.go and not g.dead
+    assert g.spd > 0.5 * g.mspd
+    g._quit()
@@ -0,0 +1,44 @@
+import os
+import socket
+
+import pytest
+
+pytest.importorskip("pygame")
+import roadrash as rr
+
+posix = pytest.mark.skipif(os.name != 'posix', reason="unix sockets")
+
+
+@posix
+@pytest.mark.parametrize("link", [False, True])
+def test_host_keeps_what_is_not_a_socket(tmp_path, link):
+    f = tmp_path / "notes.txt"
+    f.write_text("keep me")
+    addr = f
+    if link:
+        addr = tmp_path / "host.sock"
+        addr.symlink_to(f)
+    with pytest.raises(FileExistsError):
+        rr.host(str(addr), key="k")
+    assert f.read_text() == "keep me" and os.path.lexists(addr)
+
+
+@posix
+def test_host_replaces_a_stale_socket(tmp_path, monkeypatch):
+    addr = str(tmp_path / "host.sock")
+    s = socket.socket(socket.AF_UNIX)
+    s.bind(addr)
+    s.close()                           # left behind, as by a killed host
+    seen = []
+
+    class Stop(Exception):
+        pass
+
+    def listener(a, authkey):
+        seen.append(os.path.exists(a))
+        raise Stop
+    monkeypatch.setattr(rr, 'Listener', listener)
+    monkeypatch.setattr(rr, 'warm', lambda: None)
+    with pytest.raises(Stop):
+        rr.host(addr, key="k")
+    assert seen == [False]
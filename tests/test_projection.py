@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+import roadrash as rr
+
+
+def same(a, b):
+    return [list(v) for v in a] == [list(v) for v in b]
+
+
+@pytest.mark.parametrize("size", [(rr.W, rr.H), (400, 300), (1280, 720)])
+def test_numpy_matches_python(size):
+    py = rr.Road(random.Random(5), vec=False)
+    vec = rr.Road(random.Random(5), vec=True)
+    for rd in (py, vec):
+        rd.set_view(*size)
+    r = random.Random(1)
+    for _ in range(200):
+        si0, cam_x = r.randrange(rr.N_SEG), r.uniform(-0.95, 0.95) * rr.ROAD_W
+        assert same(py.project(si0, cam_x), vec.project(si0, cam_x))
+
+
+def test_endless_track_numpy_matches_python():
+    py, vec = rr.Track(7, vec=False), rr.Track(7, vec=True)
+    for si0 in (0, 63, 64, 5000, 123456789):
+        assert same(py.project(si0, 100.0), vec.project(si0, 100.0))
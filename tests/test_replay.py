@@ -0,0 +1,68 @@
+import os
+import struct
+import zlib
+
+import pytest
+
+pytest.importorskip("pygame")
+import roadrash as rr
+
+
+def record(path, spec, seeds, ticks=900):
+    road = rr.course_road(spec)
+    sim = rr.Sim(None, road)
+    rec = rr.Recorder(path, road, rr.SIM_HZ, sim.n_riders)
+    for seed in seeds:
+        sim.reset(seed)
+        sim.go = True
+        rec.start(seed)
+        for t in range(ticks):
+            if sim.dead:
+                break
+            inp = (t % 200 < 170, t % 200 >= 190, (t // 37) % 3 - 1)
+            sim.step(1.0 / rr.SIM_HZ, inp)
+            rec.tick(inp)
+        rec.end(sim)
+    rec.close(sim)
+
+
+@pytest.mark.parametrize("spec", [['ring', 5], ['endless', 9]])
+def test_round_trip(tmp_path, spec):
+    path = str(tmp_path / "r.rrp")
+    record(path, spec, [1, 2, 3])
+    meta, races = rr.load_replay(path)
+    assert meta == {'course': spec, 'hz': rr.SIM_HZ, 'riders': rr.RIDERS}
+    assert [r['seed'] for r in races] == [1, 2, 3]
+    sim = rr.Sim(None, rr.course_road(meta['course']), meta['riders'])
+    for race in races:
+        assert rr.replay(sim, race, 1.0 / meta['hz']) == race['end']
+
+
+def test_track_file_replays_from_elsewhere(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rr.save_track(rr.course_road(['ring', 4]), "t.rrt")
+    (tmp_path / "sub").mkdir()
+    record("r.rrp", ['track', "t.rrt"], [1])
+    monkeypatch.chdir(tmp_path / "sub")
+    meta, races = rr.load_replay("../r.rrp")
+    kind, path = meta['course']
+    assert kind == 'track' and os.path.isabs(path) and os.path.samefile(path, tmp_path / "t.rrt")
+    road = rr.course_road(meta['course'])
+    try:
+        assert rr.replay(rr.Sim(None, road), races[0], 1.0 / meta['hz']) == races[0]['end']
+    finally:
+        road.close()
+
+
+def test_unseeded_course_is_refused(tmp_path):
+    with pytest.raises(ValueError):
+        rr.Recorder(str(tmp_path / "r.rrp"), rr.Road(), rr.SIM_HZ, rr.RIDERS)
+
+
+def test_truncated_race_is_rejected(tmp_path):
+    path = tmp_path / "r.rrp"
+    record(str(path), ['ring', 5], [1])
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    with pytest.raises((ValueError, struct.error, zlib.error)):
+        rr.load_replay(str(path))
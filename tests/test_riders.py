@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+import roadrash as rr
+
+
+@pytest.mark.parametrize("n", [0, 30, 600])
+def test_numpy_matches_array(n):
+    riders = []
+    for vec in (False, True):
+        rs = rr.Riders(vec=vec)
+        rs.spawn(random.Random(4), n, rr.SEG_L / rr.FPS * 9)
+        rng = random.Random(9)
+        for _ in range(300):
+            rs.step(1.0 / rr.SIM_HZ, rng)
+        riders.append(rs)
+    a, b = riders
+    assert list(a.z) == list(b.z)
+    assert list(a.lane) == list(b.lane)
+    assert list(a.tgt) == list(b.tgt)
+    assert a.start == b.start and a.order == b.order
+    assert a.slane == b.slane and a.scol == b.scol
+    for si in range(0, rr.N_SEG, 7):
+        assert sorted(a.near(si, 0.0, 0.3)) == sorted(b.near(si, 0.0, 0.3))
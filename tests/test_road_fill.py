@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+import bench
+import roadrash as rr
+
+
+@pytest.mark.parametrize("endless, bound", [(None, 0.001), (7, 0.005)])
+def test_scan_fill_matches_polygons(endless, bound):
+    """Same race frame with both fills: only strip edges may round apart."""
+    g = rr.Game()
+    bench.setup(g, 'race', 1)
+    if endless is not None:
+        g.road = rr.Track(endless)
+    for _ in range(120):
+        bench.advance(g)
+    scene = g._scene()
+    st = scene[0]
+    assert scene[1]                     # some road strips to fill
+    shot = {}
+    for fill in rr.ROAD_FILLS:
+        random.seed(0)                  # speed lines and flames
+        g.cv.raster((dict(st, fill=fill),) + scene[1:], g.prof)
+        shot[fill] = rr.pygame.surfarray.array2d(g.scr).copy()
+    g._quit()
+    diff = np.count_nonzero(shot['poly'] != shot['scan']) / shot['poly'].size
+    assert diff < bound
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("pygame")
+import bench
+import roadrash as rr
+
+
+def lods(name, lod_bias, frames=60):
+    """Sprites per kind and level over `frames` frames of a bench scenario."""
+    g = rr.Game(lod_bias=lod_bias)
+    bench.setup(g, name, 1)
+    for _ in range(frames):
+        bench.advance(g)
+        g._drw()
+    g.spr.begin()                       # fold in the last frame
+    g._quit()
+    return g.spr.lod_sum
+
+
+def test_race_frames_drop_detail():
+    tot = lods('race', 1.0)
+    assert sum(tot['T'][1:-1]) > 0
+    assert tot['bike'][0] > 0 and not any(tot['bike'][1:])     # the player's bike
+
+
+def test_traffic_bikes_drop_detail():
+    assert sum(lods('traffic', 1.0)['bike'][1:-1]) > 0
+
+
+def test_zero_bias_keeps_full_detail():
+    tot = lods('traffic', 0.0)
+    for k, n in tot.items():
+        assert not any(n[1:-1]), k
+
+
+def test_racing_frames_hit_the_cache(monkeypatch):
+    hits = dict.fromkeys('ETL', 0)
+    get = rr.SpriteCache._get
+
+    def counting(self, *a, **kw):
+        n = self.hits
+        ent = get(self, *a, **kw)
+        if self.hits > n and a[3][0] in hits:
+            hits[a[3][0]] += 1
+        return ent
+    monkeypatch.setattr(rr.SpriteCache, '_get', counting)
+    g = rr.Game()
+    bench.setup(g, 'traffic', 1)       # race's 30 riders are seldom in view
+    for _ in range(60):
+        bench.advance(g)
+        g._drw()
+    g._quit()
+    assert all(hits.values()), hits
+
+
+@pytest.mark.parametrize("kind, x, y", [('T', -59, 256), ('T', 300, 900), ('L', 400, 237), ('B', -57, 265)])
+def test_clipped_sprite_matches_direct(kind, x, y):
+    sc, f = rr.math.exp(58 / rr.SCALE_Q), 0.5
+    ext = (1, 0x5a5a) if kind == 'B' else (0,)     # colour and windows, or lod
+    a, b = rr.pygame.Surface((rr.W, rr.H)), rr.pygame.Surface((rr.W, rr.H))
+    rr.SCENERY_FN[kind](a, x, y, sc, f, *ext)
+    spr = rr.SpriteCache(lod_bias=0)   # full detail, as drawn directly
+    for _ in range(2):                  # render the window, then blit it again
+        b.fill((0, 0, 0))
+        spr.scenery(b, kind, x, y, sc, f, *ext)
+    assert spr.hits == 1 and len(next(iter(spr.d))) == 8      # a clipped window
+    assert rr.pygame.image.tobytes(a, 'RGB') == rr.pygame.image.tobytes(b, 'RGB')
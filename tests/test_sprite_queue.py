@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("pygame")
+import roadrash as rr
+
+
+def scenes(n=240, seed=3):
+    """Yield (pushed, queue) for n race frames: every sprite push() kept, in
+    push order, as (depth, kind, x, y)."""
+    g = rr.Game()
+    for i in range(0, rr.N_SEG, 2):         # plenty of buildings next to trees and lamps
+        if not any(ot == 'B' for _, ot in g.road.s[i].obj):
+            g.road.s[i].obj.append((1, 'B'))
+    g.reset(seed)
+    g.go = True
+    pushed = []
+    push = g.sq.push
+
+    def log(k, d, x, y, sc, f=0.0, ci=0, win=0):
+        m = len(g.sq)
+        push(k, d, x, y, sc, f, ci, win)
+        if len(g.sq) > m:
+            pushed.append((d, k, x, y))
+    g.sq.push = log
+    for t in range(n):
+        g.step(1.0 / rr.SIM_HZ, (True, False, (t // 50) % 3 - 1))
+        g.dead = False
+        pushed.clear()
+        _, _, q, _ = g._scene()
+        yield pushed, q
+
+
+def test_draw_order_is_far_to_near():
+    frames = 0
+    for pushed, q in scenes():
+        drawn = [(k, q.x[k][i], q.y[k][i]) for k, s, e in q.batches() for i in range(s, e)]
+        # what the old per-frame sort did, keyed on distance: stable, so
+        # sprites on one segment keep their push order
+        want = [(k, x, y) for d, k, x, y in sorted(pushed, key=lambda p: -p[0])]
+        assert drawn == want
+        frames += bool(pushed)
+    assert frames > 100
+
+
+def test_cull_and_reuse():
+    q = rr.SpriteQueue(depth=8, cap=1)
+    q.begin(100, 100)
+    q.push('T', 5, 50, 50, 1.0)
+    q.push('T', 5, 60, 50, 1.0)             # grows past cap
+    q.push('E', 2, 50, 50, 1.0)
+    q.push('L', 2, -500, 50, 1.0)           # off screen
+    assert len(q) == 3 and q.culled == 1
+    assert list(q.batches()) == [('T', 0, 2), ('E', 0, 1)]
+    q.begin(100, 100)
+    assert len(q) == 0 and list(q.batches()) == []
@@ -0,0 +1,14 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+import roadrash as rr
+
+
+def test_panels_are_bounded():
+    tc = rr.TextCache(panel_cap=8)
+    hud = tc.panel(800, 48, (10, 10, 30, 180))
+    for ll in range(1, 31):                     # speed lines at every speed
+        for la in range(0, 60, 7):
+            tc.panel(2, ll, (255, 255, 255, la))
+            assert tc.panel(800, 48, (10, 10, 30, 180)) is hud     # used every frame
+    assert len(tc.panels) == 8
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+pytest.importorskip("pygame")
+import roadrash as rr
+
+
+def segs(road, n):
+    return [(s.c, s.h, s.win, s.obj) for s in map(road.get, range(n))]
+
+
+def test_ring_round_trip(tmp_path):
+    road = rr.Road(random.Random(2))
+    path = str(tmp_path / "ring.rrt")
+    rr.save_track(road, path)
+    mr = rr.MappedRoad(path)
+    try:
+        assert mr.n == road.n and mr.seed == road.seed
+        assert segs(mr, road.n) == segs(road, road.n)
+        assert mr.get(road.n + 5).c == road.get(5).c      # wraps like the ring
+        assert mr.project(17, 0.0)[3] == road.project(17, 0.0)[3]
+    finally:
+        mr.close()
+
+
+def test_endless_prefix_round_trip(tmp_path):
+    tr = rr.Track(7)
+    path = str(tmp_path / "long.rrt")
+    rr.save_track(tr, path, 1000)
+    mr = rr.MappedRoad(path)
+    try:
+        assert mr.n == 1000
+        assert segs(mr, 1000) == segs(rr.Track(7), 1000)
+    finally:
+        mr.close()
+
+
+def test_rejects_bad_files(tmp_path):
+    path = tmp_path / "bad.rrt"
+    rr.save_track(rr.Road(random.Random(2)), str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        rr.MappedRoad(str(path))
+    path.write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        rr.MappedRoad(str(path))
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+pytest.importorskip("pygame")
+import roadrash as rr
+
+
+def run_frames(g, n):
+    """Run the game loop for n presented frames."""
+    shown = [0]
+    present = g.disp.present
+
+    def counted(win):
+        shown[0] += 1
+        if shown[0] == n:
+            rr.pygame.event.post(rr.pygame.event.Event(rr.pygame.QUIT))
+        present(win)
+    g.disp.present = counted
+    g.run()
+
+
+def test_worker_stages_reach_the_profile(tmp_path):
+    g = rr.Game(worker=True, prof_out=str(tmp_path / "prof"))
+    assert g.cv is None and g.spr is None       # the Canvas lives in the worker
+    run_frames(g, 30)
+    info = json.loads((tmp_path / "prof.json").read_text())
+    st = info['stages_ms']
+    assert st['bg']['p50'] > 0 and st['sprites']['p50'] > 0
+    # worker stages overlap the game's own, so they stay out of frame time
+    rows = (tmp_path / "prof.csv").read_text().splitlines()
+    cols = rows[0].split(',')
+    for r in rows[1:]:
+        v = dict(zip(cols, map(float, r.split(','))))
+        off = sum(v[k] for k in ('bg', 'sprites', 'player', 'hud'))     # worker only
+        assert v['frame'] <= sum(v[k] for k in rr.PROF_STAGES) - off + 1e-3
+    c = info['counters']
+    assert c['sprite_cache']['hits'] > 0 and c['text_cache']['entries'] > 0
+    assert info['calls_per_frame'] > 0